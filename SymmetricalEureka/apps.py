@@ -0,0 +1,14 @@
+"""
+Application configuration for SymmetricalEureka.
+"""
+
+from django.apps import AppConfig
+
+
+class SymmetricalEurekaConfig(AppConfig):
+    """ AppConfig that connects the signal handlers."""
+    name = 'SymmetricalEureka'
+
+    def ready(self):
+        # pylint: disable=unused-variable
+        from . import signals
@@ -0,0 +1,39 @@
+"""
+Helpers for writing many rows in few statements.
+"""
+
+from django.db.models import Case, Value, When
+
+# SQLite allows at most 999 parameters in a statement.
+MAX_QUERY_PARAMS = 999
+
+
+def chunks(items, size):
+    """ Yield successive lists of at most size items."""
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def bulk_update(objs, fields):
+    """
+    Save fields of objs with one UPDATE ... SET field = CASE pk WHEN ...
+    statement per chunk, which is what QuerySet.bulk_update does in newer
+    versions of Django.
+    """
+    if not objs:
+        return
+    model = type(objs[0])
+    # Each object takes a WHEN pk and a THEN value per field, plus the IN.
+    size = max(1, MAX_QUERY_PARAMS // (2 * len(fields) + 1))
+    for chunk in chunks(objs, size):
+        updates = {}
+        for field in fields:
+            model_field = model._meta.get_field(field)
+            updates[field] = Case(
+                *[When(pk=obj.pk, then=Value(getattr(obj, field),
+                                             output_field=model_field))
+                  for obj in chunk],
+                output_field=model_field)
+        model.objects.filter(pk__in=[obj.pk for obj in chunk]).update(
+            **updates)
@@ -0,0 +1,121 @@
+"""
+Read-through cache of serialized spells.
+
+Payloads are looked up first in a small per-process LRU, then in the Django
+cache named by the SPELL_CACHE setting (default 'default'), and only then
+serialized from the database.  Keys include the catalog version, so any
+write to the catalog makes every cached payload unreachable.
+"""
+
+from collections import OrderedDict
+from hashlib import md5
+from threading import RLock
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .catalog import get_catalog_version
+from .models import SpellListing
+from .serializers import SpellListingSerializer
+
+
+class LRUCache(object):
+    """ Thread safe mapping that holds at most maxsize recently used items."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, key, default=None):
+        """ Return the value for key, marking it as recently used."""
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return default
+            self._data[key] = value
+            return value
+
+    def set(self, key, value):
+        """ Store value under key, evicting the least recently used item."""
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """ Remove every item."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SpellPayloadCache(object):
+    """ Two tier read-through cache of SpellListingSerializer payloads."""
+    key_format = 'SymmetricalEureka:spell:{}:{}'
+    local_size = 1024
+    timeout = 24 * 60 * 60
+
+    def __init__(self):
+        self.local = LRUCache(self.local_size)
+
+    @property
+    def shared(self):
+        """ The Django cache backing the local tier."""
+        return caches[getattr(settings, 'SPELL_CACHE', 'default')]
+
+    def make_key(self, version, name):
+        """ Return the cache key of the spell called name at version."""
+        return self.key_format.format(
+            version, md5(name.encode('utf-8')).hexdigest())
+
+    def get_many(self, names):
+        """
+        Return a dict mapping each name in names to its serialized spell.
+        Names that aren't in the catalog are left out.
+        """
+        version = get_catalog_version()
+        keys = {self.make_key(version, name): name for name in names}
+        found = {}
+        missing = []
+        for key, name in keys.items():
+            payload = self.local.get(key)
+            if payload is None:
+                missing.append(key)
+            else:
+                found[name] = payload
+
+        if missing:
+            for key, payload in self.shared.get_many(missing).items():
+                self.local.set(key, payload)
+                found[keys[key]] = payload
+            missing = [keys[key] for key in missing if keys[key] not in found]
+
+        if missing:
+            fresh = {}
+            for payload in SpellListingSerializer.from_values(
+                    SpellListing.objects.filter(name__in=missing).values(
+                        *SpellListingSerializer.value_fields())):
+                key = self.make_key(version, payload['name'])
+                self.local.set(key, payload)
+                fresh[key] = payload
+                found[payload['name']] = payload
+            self.shared.set_many(fresh, self.timeout)
+
+        return found
+
+    def get(self, name):
+        """ Return the serialized spell called name, or None."""
+        return self.get_many([name]).get(name)
+
+    def clear_local(self):
+        """ Drop the payloads held by this process."""
+        self.local.clear()
+
+
+# pylint: disable=invalid-name
+spell_cache = SpellPayloadCache()
@@ -0,0 +1,213 @@
+"""
+Versioned snapshots of the spell catalog.
+
+The catalog only changes when spells are imported, so everything derived
+from it is keyed on a catalog version.  The version is a random token held
+in the CatalogVersion row, and replaced by the signal handlers in signals.py
+on any write to SpellListing or SpellClasses, so every process sees a write
+as soon as it is committed.
+"""
+
+from collections import OrderedDict
+from threading import RLock
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+from django.template.loader import get_template
+
+from .models import (CASTER_CLASSES, COMPONENTS, SCHOOLS, CatalogVersion,
+                     SpellClasses, SpellListing)
+from .renderers import PlainJSONRenderer
+from .serializers import SpellListingSerializer
+
+CATALOG_SNAPSHOT_KEY = 'SymmetricalEureka:catalog_snapshot:{}'
+
+
+def get_catalog_version():
+    """ Return the current catalog version."""
+    version = CatalogVersion.objects.filter(pk=1).values_list(
+        'version', flat=True).first()
+    if version is None:
+        version = CatalogVersion.objects.get_or_create(
+            pk=1, defaults={'version': uuid4().hex})[0].version
+    return version
+
+
+def bump_catalog_version():
+    """
+    Mark everything derived from the catalog as out of date.  Returns the
+    old and the new version.
+    """
+    version = uuid4().hex
+    with transaction.atomic():
+        old_version = CatalogVersion.objects.select_for_update().filter(
+            pk=1).values_list('version', flat=True).first()
+        if old_version is None:
+            old_version = get_catalog_version()
+        CatalogVersion.objects.filter(pk=1).update(version=version)
+    cache.delete(CATALOG_SNAPSHOT_KEY.format(old_version))
+    return old_version, version
+
+
+def build_catalog_snapshot(version):
+    """ Serialize the whole catalog as compact JSON."""
+    classes = OrderedDict((cls, []) for cls, _ in CASTER_CLASSES)
+    for cls, name in SpellClasses.objects.order_by(
+            'caster_class', 'spell__name').values_list('caster_class',
+                                                       'spell__name'):
+        classes.setdefault(cls, []).append(name)
+    spells = SpellListingSerializer.from_values(
+        SpellListing.objects.order_by('name').values(
+            *SpellListingSerializer.value_fields()))
+    return PlainJSONRenderer().render(OrderedDict([
+        ('version', version), ('spells', spells), ('classes', classes)]))
+
+
+def get_catalog_snapshot():
+    """
+    Return the current catalog version and the catalog serialized at that
+    version, building the snapshot only if it isn't already cached.
+    """
+    version = get_catalog_version()
+    key = CATALOG_SNAPSHOT_KEY.format(version)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_catalog_snapshot(version)
+        cache.set(key, snapshot, None)
+    return version, snapshot
+
+
+def iter_bits(bits):
+    """ Yield the positions of the set bits of an integer, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class SpellIndex(object):
+    """
+    In-process bitmap index over the catalog.  Spells are numbered by their
+    position in name order, and each class, level and school is a bitset
+    over those numbers held in a Python int, so combining filters is a
+    bitwise AND and no database query is needed to answer them.
+    """
+    # Filters of parse_spell_query() that match any of several values.
+    choice_filters = ('class', 'level', 'school', 'component')
+
+    def __init__(self, version):
+        self.version = version
+        self.names = []
+        self.all = 0
+        self.classes = {cls: 0 for cls, _ in CASTER_CLASSES}
+        self.levels = {level: 0 for level in range(10)}
+        self.schools = {school: 0 for school, _ in SCHOOLS}
+        self.components = {component: 0 for component, _ in COMPONENTS}
+        self.ritual = 0
+        self.concentration = 0
+        self.ordinals = {}
+
+    @classmethod
+    def build(cls, version):
+        """ Build the index from the database."""
+        index = cls(version)
+        for i, (name, level, school, components, ritual,
+                concentration) in enumerate(
+                    SpellListing.objects.order_by('name').values_list(
+                        'name', 'level', 'school', 'components', 'ritual',
+                        'concentration')):
+            bit = 1 << i
+            index.names.append(name)
+            index.ordinals[name] = i
+            index.all |= bit
+            index.levels[level] = index.levels.get(level, 0) | bit
+            index.schools[school] = index.schools.get(school, 0) | bit
+            index.components[components] = index.components.get(
+                components, 0) | bit
+            if ritual:
+                index.ritual |= bit
+            if concentration:
+                index.concentration |= bit
+        for caster_class, name in SpellClasses.objects.values_list(
+                'caster_class', 'spell__name'):
+            if name in index.ordinals:
+                index.classes[caster_class] = index.classes.get(
+                    caster_class, 0) | (1 << index.ordinals[name])
+        return index
+
+    def select(self, query):
+        """
+        Return the bitset of the spells matching query, a dict in the form
+        returned by filters.parse_spell_query().
+        """
+        bitsets = {'class': self.classes, 'level': self.levels,
+                   'school': self.schools, 'component': self.components}
+        bits = self.all
+        for name in self.choice_filters:
+            if query.get(name):
+                union = 0
+                for value in query[name]:
+                    union |= bitsets[name].get(value, 0)
+                bits &= union
+        for name in ('ritual', 'concentration'):
+            if query.get(name) is not None:
+                bitset = getattr(self, name)
+                bits &= bitset if query[name] else ~bitset
+        return bits
+
+    def spell_names(self, bits):
+        """ Return the names of the spells in bits, in name order."""
+        return [self.names[i] for i in iter_bits(bits)]
+
+
+# pylint: disable=invalid-name
+_spell_index = None
+_spell_index_lock = RLock()
+
+
+def get_spell_index():
+    """
+    Return the bitmap index for the current catalog version, rebuilding it
+    if the catalog has changed since it was built.
+    """
+    # pylint: disable=global-statement
+    global _spell_index
+    version = get_catalog_version()
+    index = _spell_index
+    if index is None or index.version != version:
+        with _spell_index_lock:
+            if _spell_index is None or _spell_index.version != version:
+                _spell_index = SpellIndex.build(version)
+            index = _spell_index
+    return index
+
+
+# pylint: disable=invalid-name
+_spell_rows = (None, [])
+_spell_rows_lock = RLock()
+
+
+def render_spell_rows():
+    """
+    Render the cells of each spell's row of the spell table, other than the
+    user's star, in name order.  Returns a list of (pk, html) pairs.
+    """
+    template = get_template('SymmetricalEureka/spell_row.html')
+    return [(spell.pk, template.render({'spell': spell}))
+            for spell in SpellListing.objects.order_by('name')]
+
+
+def get_spell_rows():
+    """
+    Return the rendered spell table rows for the current catalog version,
+    rendering them again only if the catalog has changed.
+    """
+    # pylint: disable=global-statement
+    global _spell_rows
+    version = get_catalog_version()
+    if _spell_rows[0] != version:
+        with _spell_rows_lock:
+            if _spell_rows[0] != version:
+                _spell_rows = (version, render_spell_rows())
+    return _spell_rows[1]
@@ -0,0 +1,263 @@
+"""
+Streaming import and export of the spell catalog.
+
+A catalog file holds one record per spell: the SpellListing fields, plus a
+`classes` list of CASTER_CLASSES keys.  Records are either JSON objects, one
+per line, or CSV rows with a header and the classes separated by spaces.
+Exported files can be imported again unchanged.
+"""
+
+import csv
+import json
+from collections import Counter, OrderedDict
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import six
+
+from .bulk import MAX_QUERY_PARAMS, bulk_update, chunks
+from .cache import spell_cache
+from .catalog import bump_catalog_version
+from .filters import FALSE_VALUES, TRUE_VALUES
+from .models import CASTER_CLASSES, SpellClasses, SpellListing
+from .search import get_search_index
+
+SPELL_FIELDS = ('name', 'level', 'school', 'components', 'ritual',
+                'concentration', 'casting_time', 'spell_range', 'duration',
+                'page', 'material_components', 'description')
+CSV_FIELDS = SPELL_FIELDS + ('classes',)
+
+
+class CatalogError(ValueError):
+    """ Raised for a catalog record that can't be imported."""
+
+
+def read_jsonl(lines):
+    """ Yield the records of a JSON lines catalog."""
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as err:
+            raise CatalogError('line {}: {}'.format(number, err))
+        if not isinstance(record, dict):
+            raise CatalogError('line {}: expected an object'.format(number))
+        yield record
+
+
+def read_csv(lines):
+    """ Yield the records of a CSV catalog read from lines of text."""
+    if six.PY2:
+        # The Python 2 csv module only reads byte strings.
+        lines = (line.encode('utf-8') for line in lines)
+    for record in csv.DictReader(lines):
+        if six.PY2:
+            record = {key.decode('utf-8'): value.decode('utf-8')
+                      if isinstance(value, bytes) else value
+                      for key, value in record.items()}
+        if record.get('classes') is not None:
+            record['classes'] = record['classes'].split()
+        yield record
+
+
+def to_bool(name, value):
+    """ Convert a boolean field read from a catalog file."""
+    if isinstance(value, six.string_types):
+        if value.lower() in TRUE_VALUES:
+            return True
+        if value.lower() in FALSE_VALUES or value == '':
+            return False
+        raise CatalogError('{}: expected a boolean, got "{}"'.format(
+            name, value))
+    return bool(value)
+
+
+def build_spell(record):
+    """
+    Return the unsaved SpellListing and the set of classes described by
+    record.  The classes are None if the record doesn't list any.
+    """
+    spell = SpellListing(**{field: record[field] for field in SPELL_FIELDS
+                            if field in record})
+    for field in ('ritual', 'concentration'):
+        setattr(spell, field, to_bool(field, getattr(spell, field)))
+    try:
+        # The published catalog marks costly material components with codes
+        # such as 'VMgp' that aren't in COMPONENTS, and loaddata accepts them.
+        spell.clean_fields(exclude=('components',))
+    except ValidationError as err:
+        raise CatalogError('{}: {}'.format(record.get('name'), err))
+
+    classes = record.get('classes')
+    if classes is not None:
+        classes = set(classes)
+        unknown = classes - set(dict(CASTER_CLASSES))
+        if unknown:
+            raise CatalogError('{}: unknown classes {}'.format(
+                spell.name, ', '.join(sorted(unknown))))
+    return spell, classes
+
+
+def _import_batch(batch, stats, written):
+    """
+    Upsert a batch of (spell, classes) pairs keyed by name, adding the ids
+    of the spells created or updated to written.
+    """
+    names = list(batch)
+    with transaction.atomic():
+        existing = {row['name']: row
+                    for row in SpellListing.objects.filter(
+                        name__in=names).values('pk', *SPELL_FIELDS)}
+        new = []
+        changed = []
+        for name, (spell, _) in batch.items():
+            if name not in existing:
+                new.append(spell)
+            elif any(getattr(spell, field) != existing[name][field]
+                     for field in SPELL_FIELDS):
+                spell.pk = existing[name]['pk']
+                changed.append(spell)
+        SpellListing.objects.bulk_create(new)
+        bulk_update(changed, SPELL_FIELDS[1:])
+        written.extend(spell.pk for spell in changed)
+        if new:
+            written.extend(SpellListing.objects.filter(
+                name__in=[spell.name for spell in new]).values_list(
+                    'pk', flat=True))
+        stats['created'] += len(new)
+        stats['updated'] += len(changed)
+        stats['unchanged'] += len(batch) - len(new) - len(changed)
+
+        listed = [name for name, (_, classes) in batch.items()
+                  if classes is not None]
+        if not listed:
+            return
+        pks = dict(SpellListing.objects.filter(name__in=listed).values_list(
+            'name', 'pk'))
+        current = set(SpellClasses.objects.filter(
+            spell__name__in=listed).values_list('spell__name',
+                                                'caster_class'))
+        wanted = {(name, cls) for name in listed for cls in batch[name][1]}
+
+        SpellClasses.objects.bulk_create(
+            [SpellClasses(spell_id=pks[name], caster_class=cls)
+             for name, cls in sorted(wanted - current)])
+        for chunk in chunks(sorted(current - wanted),
+                            MAX_QUERY_PARAMS // 2):
+            SpellClasses.objects.filter(reduce(or_, [
+                Q(spell__name=name, caster_class=cls)
+                for name, cls in chunk])).delete()
+        stats['classes_added'] += len(wanted - current)
+        stats['classes_removed'] += len(current - wanted)
+
+
+def refresh_derived_data(pks=None):
+    """
+    Bring everything derived from the catalog up to date after writes that
+    bypass the model signals.  pks are the ids of the spells that were
+    created, updated or deleted; if they aren't known, the search index is
+    rebuilt.
+    """
+    old_version, version = bump_catalog_version()
+    spell_cache.clear_local()
+    if pks is None:
+        get_search_index().rebuild()
+    else:
+        get_search_index().update(pks, old_version, version)
+
+
+def import_catalog(records, batch_size=500):
+    """
+    Create or update a SpellListing, and its SpellClasses, for each record.
+    Records are processed in batches of batch_size, each in its own
+    transaction, and only rows that differ from the database are written.
+    Returns a Counter of what was done.
+    """
+    stats = Counter()
+    written = []
+    batch = OrderedDict()
+    for record in records:
+        spell, classes = build_spell(record)
+        batch[spell.name] = (spell, classes)
+        if len(batch) >= batch_size:
+            _import_batch(batch, stats, written)
+            batch = OrderedDict()
+    if batch:
+        _import_batch(batch, stats, written)
+    if stats['created'] or stats['updated'] or stats['classes_added'] or \
+            stats['classes_removed']:
+        refresh_derived_data(written)
+    return stats
+
+
+class Echo(object):
+    """ File-like object whose write returns what was written."""
+
+    # pylint: disable=no-self-use
+    def write(self, value):
+        """ Return value instead of storing it."""
+        return value
+
+
+def iter_catalog(queryset, with_classes=True):
+    """
+    Yield a record for each spell in queryset, in name order.  Spells and
+    their classes are read with two ordered iterators merged in step, so
+    memory use doesn't grow with the size of the catalog.
+    """
+    spells = queryset.order_by('name').values_list(*SPELL_FIELDS).iterator()
+    if with_classes:
+        classes = SpellClasses.objects.filter(spell__in=queryset).order_by(
+            'spell__name', 'caster_class').values_list(
+                'spell__name', 'caster_class').iterator()
+        pending = next(classes, None)
+    for row in spells:
+        record = OrderedDict(zip(SPELL_FIELDS, row))
+        if with_classes:
+            record['classes'] = []
+            while pending is not None and pending[0] == record['name']:
+                record['classes'].append(pending[1])
+                pending = next(classes, None)
+        yield record
+
+
+def write_jsonl(records):
+    """ Yield the lines of a JSON lines catalog."""
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+def _csv_writerow(writer, row):
+    """ Return row written by writer as a line of text."""
+    if six.PY2:
+        # The Python 2 csv module only writes byte strings.
+        return writer.writerow([
+            value.encode('utf-8') if isinstance(value, six.text_type)
+            else value for value in row]).decode('utf-8')
+    return writer.writerow(row)
+
+
+def write_csv(records, with_classes=True):
+    """ Yield the lines of a CSV catalog as text."""
+    writer = csv.writer(Echo())
+    yield _csv_writerow(writer, CSV_FIELDS if with_classes else SPELL_FIELDS)
+    for record in records:
+        if with_classes:
+            record['classes'] = ' '.join(record['classes'])
+        yield _csv_writerow(writer, list(record.values()))
+
+
+CONTENT_TYPES = {'jsonl': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+def export_catalog(queryset, fmt, with_classes=True):
+    """ Yield the lines of the spells in queryset as a catalog file."""
+    records = iter_catalog(queryset, with_classes)
+    if fmt == 'csv':
+        return write_csv(records, with_classes)
+    return write_jsonl(records)
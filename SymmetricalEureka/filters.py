@@ -0,0 +1,140 @@
+"""
+Filter backends for the REST API.
+"""
+from __future__ import unicode_literals
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import (CASTER_CLASSES, COMPONENTS, SCHOOLS, SpellClasses,
+                     SpellListing)
+
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+FALSE_VALUES = ('0', 'false', 'no', 'off')
+
+
+def parse_bool(name, value):
+    """ Convert a query parameter to a boolean, or raise ValidationError."""
+    value = value.lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValidationError({name: 'Expected a boolean, got "{}".'.format(
+        value)})
+
+
+def parse_choice(name, value, choices):
+    """ Check that value is one of the keys of choices."""
+    if value not in dict(choices):
+        raise ValidationError({name: '"{}" is not a valid choice.'.format(
+            value)})
+    return value
+
+
+def parse_level(name, value):
+    """ Convert a level query parameter to an integer between 0 and 9."""
+    if value.lower() == 'cantrip':
+        return 0
+    try:
+        level = int(value)
+    except ValueError:
+        level = -1
+    if not 0 <= level <= 9:
+        raise ValidationError({name: '"{}" is not a valid level.'.format(
+            value)})
+    return level
+
+
+def get_values(params, name):
+    """
+    Return the non-empty values of a query parameter that may be repeated or
+    given as a comma separated list.
+    """
+    return [value for values in params.getlist(name)
+            for value in values.split(',') if value]
+
+
+def parse_fields(params, fields):
+    """
+    Return the names in fields selected by the fields and exclude query
+    parameters, in the order of fields, or None if neither is given.
+    """
+    selected = {}
+    for name in ('fields', 'exclude'):
+        selected[name] = set(get_values(params, name))
+        for value in selected[name]:
+            if value not in fields:
+                raise ValidationError(
+                    {name: '"{}" is not a valid field.'.format(value)})
+    if not selected['fields'] and not selected['exclude']:
+        return None
+    return tuple(field for field in fields
+                 if field in (selected['fields'] or fields) and
+                 field not in selected['exclude'])
+
+
+def parse_spell_query(params):
+    """
+    Parse the spell filter query parameters into a dict.  class, level,
+    school and component may each have several values and match a spell
+    with any of them; ritual and concentration are booleans.  Filters that
+    are not given are None.
+    """
+    query = {
+        'class': {parse_choice('class', value, CASTER_CLASSES)
+                  for value in get_values(params, 'class')},
+        'level': {parse_level('level', value)
+                  for value in get_values(params, 'level')},
+        'school': {parse_choice('school', value, SCHOOLS)
+                   for value in get_values(params, 'school')},
+        'component': {parse_choice('component', value, COMPONENTS)
+                      for value in get_values(params, 'component')},
+    }
+    for name in query:
+        query[name] = query[name] or None
+    for name in ('ritual', 'concentration'):
+        value = params.get(name)
+        query[name] = parse_bool(name, value) if value else None
+    return query
+
+
+class SpellFilterBackend(BaseFilterBackend):
+    """
+    Filter a SpellListing queryset by the query parameters understood by
+    parse_spell_query, and by starred.  Every filter is applied in SQL, so
+    only the matching rows are ever loaded.
+    """
+
+    # pylint: disable=no-self-use
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        query = parse_spell_query(params)
+
+        if query['class']:
+            queryset = queryset.filter(pk__in=SpellClasses.objects.filter(
+                caster_class__in=query['class']).values('spell'))
+
+        for field, name in (('level', 'level'), ('school', 'school'),
+                            ('components', 'component')):
+            if query[name]:
+                queryset = queryset.filter(**{field + '__in': query[name]})
+
+        for name in ('ritual', 'concentration'):
+            if query[name] is not None:
+                queryset = queryset.filter(**{name: query[name]})
+
+        starred = params.get('starred')
+        if starred:
+            starred = parse_bool('starred', starred)
+            if request.user.is_authenticated():
+                mine = SpellListing.objects.filter(
+                    userprofile__user=request.user).values('pk')
+                if starred:
+                    queryset = queryset.filter(pk__in=mine)
+                else:
+                    queryset = queryset.exclude(pk__in=mine)
+            elif starred:
+                queryset = queryset.none()
+
+        return queryset
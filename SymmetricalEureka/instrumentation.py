@@ -0,0 +1,217 @@
+"""
+Per-request query and timing instrumentation.
+
+Views wrapped with instrumented() are measured by InstrumentationMiddleware:
+the number and total time of their SQL queries, the time spent rendering
+templates and REST responses, the time spent in serializers, and the total
+time of the request.  Each response reports these in a Server-Timing header,
+and the totals for each view are kept in process by `registry`, which
+MetricsView serves in the Prometheus text format.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import islice
+from threading import Lock, local
+from timeit import default_timer
+
+from django.db import connections
+
+try:
+    from django.utils.deprecation import MiddlewareMixin
+except ImportError:
+    # For Django before 1.10, which only has MIDDLEWARE_CLASSES.
+    MiddlewareMixin = object
+
+# pylint: disable=invalid-name
+_local = local()
+
+
+def instrumented(view, label=None):
+    """
+    Mark view to be measured by InstrumentationMiddleware, reporting under
+    label, which defaults to the name of the view.
+    """
+    view.instrumented = label or view.__name__
+    return view
+
+
+class RequestMetrics(object):
+    """ The measurements of one request."""
+
+    def __init__(self, label):
+        self.label = label
+        self.start = default_timer()
+        self.total = 0.0
+        self.queries = 0
+        self.sql = 0.0
+        self.durations = defaultdict(float)
+        self.running = set()
+        self._render_start = None
+        self._connections = []
+
+    def begin(self):
+        """ Start logging the queries of every database connection."""
+        for connection in connections.all():
+            self._connections.append((
+                connection, connection.force_debug_cursor,
+                len(connection.queries_log)))
+            connection.force_debug_cursor = True
+
+    def end(self):
+        """ Count the queries logged since begin, and stop logging them."""
+        for connection, force_debug_cursor, start in self._connections:
+            for query in islice(connection.queries_log, start, None):
+                self.queries += 1
+                self.sql += float(query['time'])
+            connection.force_debug_cursor = force_debug_cursor
+        self._connections = []
+        self.total = default_timer() - self.start
+
+    def render_started(self):
+        """ Note that the response is about to be rendered."""
+        self._render_start = default_timer()
+
+    def render_finished(self, response):
+        """ Post render callback that records the time taken to render."""
+        if self._render_start is not None:
+            self.durations['render'] += default_timer() - self._render_start
+            self._render_start = None
+        return response
+
+    def server_timing(self):
+        """ Return the value of the Server-Timing header."""
+        metrics = [
+            'db;dur={:.3f};desc="{} queries"'.format(self.sql * 1000,
+                                                     self.queries)]
+        for name in sorted(self.durations):
+            metrics.append('{};dur={:.3f}'.format(
+                name, self.durations[name] * 1000))
+        metrics.append('total;dur={:.3f}'.format(self.total * 1000))
+        return ', '.join(metrics)
+
+
+def current_metrics():
+    """ Return the metrics of the request being handled, or None."""
+    return getattr(_local, 'metrics', None)
+
+
+@contextmanager
+def timer(name):
+    """
+    Add the time spent in the block to the current request's duration for
+    name.  Nested blocks with the same name are only counted once.
+    """
+    metrics = current_metrics()
+    if metrics is None or name in metrics.running:
+        yield
+        return
+    metrics.running.add(name)
+    start = default_timer()
+    try:
+        yield
+    finally:
+        metrics.running.discard(name)
+        metrics.durations[name] += default_timer() - start
+
+
+class TimedSerializerMixin(object):
+    """ Serializer mixin that times serialization as 'serializer'."""
+
+    def to_representation(self, instance):
+        with timer('serializer'):
+            return super(TimedSerializerMixin, self).to_representation(
+                instance)
+
+
+class MetricsRegistry(object):
+    """ Thread safe totals of the measurements of each view."""
+    prefix = 'symmetricaleureka_'
+    # (name, attribute of RequestMetrics or key of its durations, help)
+    counters = (
+        ('requests_total', None, 'Requests handled.'),
+        ('queries_total', 'queries', 'SQL queries made.'),
+        ('sql_seconds_total', 'sql', 'Time spent in SQL queries.'),
+        ('render_seconds_total', 'render', 'Time spent rendering responses.'),
+        ('serializer_seconds_total', 'serializer',
+         'Time spent in serializers.'),
+        ('request_seconds_total', 'total', 'Time spent handling requests.'),
+    )
+
+    def __init__(self):
+        self._lock = Lock()
+        self._totals = defaultdict(lambda: defaultdict(float))
+
+    def record(self, metrics):
+        """ Add the measurements of a request to the totals of its view."""
+        with self._lock:
+            totals = self._totals[metrics.label]
+            for name, source, _ in self.counters:
+                if source is None:
+                    totals[name] += 1
+                elif hasattr(metrics, source):
+                    totals[name] += getattr(metrics, source)
+                else:
+                    totals[name] += metrics.durations.get(source, 0.0)
+
+    def totals(self, label):
+        """ Return a copy of the totals of the view label."""
+        with self._lock:
+            return dict(self._totals.get(label, {}))
+
+    def clear(self):
+        """ Forget every measurement."""
+        with self._lock:
+            self._totals.clear()
+
+    def render(self):
+        """ Return the totals in the Prometheus text exposition format."""
+        with self._lock:
+            totals = sorted((label, dict(values))
+                            for label, values in self._totals.items())
+        lines = []
+        for name, _, description in self.counters:
+            lines.append('# HELP {}{} {}'.format(self.prefix, name,
+                                                 description))
+            lines.append('# TYPE {}{} counter'.format(self.prefix, name))
+            for label, values in totals:
+                lines.append('{}{}{{view="{}"}} {!r}'.format(
+                    self.prefix, name,
+                    label.replace('\\', '\\\\').replace('"', '\\"'),
+                    float(values.get(name, 0.0))))
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class InstrumentationMiddleware(MiddlewareMixin):
+    """
+    Measure requests to views marked with instrumented(), and report the
+    measurements in a Server-Timing header and to `registry`.  Works in
+    both MIDDLEWARE and MIDDLEWARE_CLASSES.
+    """
+
+    # pylint: disable=no-self-use,unused-argument
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        label = getattr(view_func, 'instrumented', None)
+        if label is not None:
+            metrics = RequestMetrics(label)
+            metrics.begin()
+            request.instrumentation = _local.metrics = metrics
+
+    def process_template_response(self, request, response):
+        metrics = getattr(request, 'instrumentation', None)
+        if metrics is not None:
+            metrics.render_started()
+            response.add_post_render_callback(metrics.render_finished)
+        return response
+
+    def process_response(self, request, response):
+        metrics = getattr(request, 'instrumentation', None)
+        if metrics is not None:
+            _local.metrics = None
+            metrics.end()
+            response['Server-Timing'] = metrics.server_timing()
+            registry.record(metrics)
+        return response
@@ -0,0 +1,113 @@
+"""
+Management command to check that the spell filters use their indexes.
+"""
+
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from ...models import SpellClasses, SpellListing
+from ...synthetic import seed_catalog
+
+
+class Rollback(Exception):
+    """ Raised to discard the synthetic catalog."""
+
+
+def filter_queries():
+    """
+    Return (description, queryset, model, columns) for each filter query,
+    where columns are those of the index the query should use.  These are
+    the queries SpellFilterBackend makes for the filters of SpellListView
+    and SpellClassesView.
+    """
+    wizard = SpellClasses.objects.filter(
+        caster_class__in=['wi']).values('spell')
+    return [
+        ('class', SpellListing.objects.filter(pk__in=wizard),
+         SpellClasses, ('caster_class', 'spell_id')),
+        ('level', SpellListing.objects.filter(level__in=[3]),
+         SpellListing, ('level', 'school')),
+        ('level and school', SpellListing.objects.filter(
+            level__in=[3], school__in=['ev']),
+         SpellListing, ('level', 'school')),
+    ]
+
+
+def index_names(model, columns):
+    """ Return the names of the indexes of model on exactly columns."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, model._meta.db_table)
+    return [name for name, constraint in constraints.items()
+            if constraint['index'] and
+            tuple(constraint['columns']) == tuple(columns)]
+
+
+def query_plan(queryset):
+    """ Return the database's plan for queryset as one string."""
+    sql, params = queryset.query.sql_with_params()
+    if connection.vendor == 'sqlite':
+        sql = 'EXPLAIN QUERY PLAN ' + sql
+    else:
+        sql = 'EXPLAIN ' + sql
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return '\n'.join(' '.join(str(column) for column in row)
+                         for row in cursor.fetchall())
+
+
+class Command(BaseCommand):
+    """
+    Add a synthetic catalog, then report for each filter query the index
+    its plan uses and how long it takes.  The catalog is rolled back
+    afterwards, and the command fails if any query doesn't use its index.
+    """
+    help = 'Check the query plans and time the spell filters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--spells', type=int, default=10000,
+                            help='Synthetic spells to add.')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Number of runs; the best and median are '
+                                 'reported.')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed of the synthetic catalog.')
+
+    def handle(self, *args, **options):
+        unindexed = []
+        try:
+            with transaction.atomic():
+                seed_catalog(options['spells'], options['seed'])
+                for description, queryset, model, columns in \
+                        filter_queries():
+                    if not self.check_query(description, queryset,
+                                            index_names(model, columns),
+                                            options['repeat']):
+                        unindexed.append(description)
+                raise Rollback()
+        except Rollback:
+            pass
+        if unindexed:
+            raise CommandError('No index used for: {}.'.format(
+                ', '.join(unindexed)))
+
+    def check_query(self, description, queryset, indexes, repeat):
+        """
+        Report the plan and time of queryset, and return whether it uses one
+        of indexes.
+        """
+        plan = query_plan(queryset)
+        used = [name for name in indexes if name in plan]
+        rows = queryset.count()
+        times = sorted(timeit.repeat(lambda: list(queryset.values_list(
+            'pk', flat=True)), number=1, repeat=repeat))
+        self.stdout.write(
+            '{}: {} rows, best {:.2f} ms, median {:.2f} ms, {}.'.format(
+                description, rows, times[0] * 1000,
+                times[len(times) // 2] * 1000,
+                'uses {}'.format(used[0]) if used else 'NO INDEX'))
+        if not used:
+            self.stdout.write(plan)
+        return bool(used)
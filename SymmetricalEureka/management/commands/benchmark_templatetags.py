@@ -0,0 +1,62 @@
+"""
+Management command to time rendering the ability scores of a character sheet.
+"""
+
+import timeit
+
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+
+from ...models import AbilityScores, Character
+from ...templatetags.SymmetricalEureka import (_bs_ability_score_display,
+                                               _bs_saving_throw_display)
+
+SHEET_TEMPLATE = """{% load SymmetricalEureka %}
+{% for abil_score in ability_scores %}
+    {% bs_ability_score_display abil_score %}
+{% endfor %}
+{% for abil_score in ability_scores %}
+    {% bs_saving_throw_display abil_score %}
+{% endfor %}"""
+
+
+class Command(BaseCommand):
+    """
+    Render the ability score and saving throw tags of an unsaved character,
+    both directly and through a template like character.html, and report
+    the time taken per sheet.  No database access is needed.
+    """
+    help = 'Time rendering the ability scores of a character sheet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sheets', type=int, default=1000,
+                            help='Sheets to render in each run.')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Number of runs; the best and median are '
+                                 'reported.')
+
+    def handle(self, *args, **options):
+        sheets = options['sheets']
+        character = Character(character_name='Benchmark')
+        scores = [AbilityScores(character=character, which=which,
+                                value=8 + 2 * i, proficient=i % 2 == 0)
+                  for i, (which, _) in enumerate(AbilityScores.WHICH_CHOICES)]
+
+        def render_tags():
+            """ Render each tag directly."""
+            for score in scores:
+                _bs_ability_score_display(score)
+                _bs_saving_throw_display(score)
+
+        template = Template(SHEET_TEMPLATE)
+        context = Context({'ability_scores': scores})
+
+        for name, func in (('tags', render_tags),
+                           ('template', lambda: template.render(context))):
+            times = sorted(timeit.repeat(func, number=sheets,
+                                         repeat=options['repeat']))
+            self.stdout.write(
+                '{}: best {:.1f} us, median {:.1f} us per sheet of {} '
+                'scores.'.format(name, times[0] / sheets * 1e6,
+                                 times[len(times) // 2] / sheets * 1e6,
+                                 len(scores)))
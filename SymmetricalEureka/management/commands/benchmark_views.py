@@ -0,0 +1,226 @@
+"""
+Management command to benchmark views through the test client.
+"""
+
+import io
+import json
+import math
+from collections import OrderedDict
+from timeit import default_timer
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.urlresolvers import reverse
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import six
+
+from ...models import Character, SpellListing
+from ...synthetic import PASSWORD
+
+try:
+    import tracemalloc
+except ImportError:
+    # For Python 2, which can't measure allocations.
+    tracemalloc = None  # pylint: disable=invalid-name
+
+
+class Rollback(Exception):
+    """ Raised to discard the writes of the benchmark."""
+
+
+def percentile(values, percent):
+    """ Return the nearest rank percentile of values."""
+    values = sorted(values)
+    return values[max(0, int(math.ceil(percent / 100.0 * len(values))) - 1)]
+
+
+def scenarios(character, spell):
+    """
+    Return (view, method, url) for each request to benchmark, as the player
+    of character.
+    """
+    return [
+        ('SpellListView', 'get', reverse('SE_spell_list')),
+        ('DisplayCharacterView', 'get', reverse(
+            'SE_character', kwargs={'Char_uuid': character.Char_uuid})),
+        ('CharacterAtributeView', 'get', reverse(
+            'SE_character_method', kwargs={'Char_uuid': character.Char_uuid,
+                                           'attribute': 'strength'})),
+        ('SpellClassesView', 'get', reverse(
+            'SE_spell_class', kwargs={'cls': 'wi'})),
+        # Toggles the star, so every request writes.
+        ('UserSpellView', 'post', reverse(
+            'UserSpell', kwargs={'name': spell.name})),
+    ]
+
+
+def measure(client, method, url, requests, allocations=0):
+    """
+    Make requests requests, and return their p50 and p95 latency, the most
+    queries any of them made, and the median peak of memory allocated by
+    allocations more requests made with tracemalloc on.
+    """
+    request = getattr(client, method)
+    times = []
+    queries = 0
+    for _ in range(requests):
+        with CaptureQueriesContext(connection) as captured:
+            start = default_timer()
+            response = request(url)
+            times.append(default_timer() - start)
+        if response.status_code >= 400:
+            raise CommandError('{} {} returned {}.'.format(
+                method.upper(), url, response.status_code))
+        queries = max(queries, len(captured))
+
+    peaks = []
+    if tracemalloc is not None:
+        for _ in range(allocations):
+            tracemalloc.start()
+            try:
+                request(url)
+                peaks.append(tracemalloc.get_traced_memory()[1])
+            finally:
+                tracemalloc.stop()
+    return OrderedDict([
+        ('p50_ms', round(percentile(times, 50) * 1000, 3)),
+        ('p95_ms', round(percentile(times, 95) * 1000, 3)),
+        ('queries', queries),
+        ('peak_kib', round(percentile(peaks, 50) / 1024.0, 1)
+         if peaks else None),
+    ])
+
+
+def compare(results, baseline, tolerance):
+    """
+    Return a line comparing each view's results to baseline, and the
+    regressions: p95 latency or allocations more than tolerance worse, or
+    any extra query.
+    """
+    lines = []
+    regressions = []
+    for view, result in results.items():
+        old = baseline.get(view)
+        if old is None:
+            lines.append('{}: not in the baseline.'.format(view))
+            continue
+        changes = []
+        for key, unit in (('p50_ms', 'ms'), ('p95_ms', 'ms'),
+                          ('peak_kib', 'KiB')):
+            if result[key] is None or not old.get(key):
+                continue
+            ratio = result[key] / old[key] - 1
+            changes.append('{} {} {} ({:+.0%})'.format(
+                key.split('_')[0], result[key], unit, ratio))
+            if key != 'p50_ms' and ratio > tolerance:
+                regressions.append('{} {}'.format(view, key.split('_')[0]))
+        changes.append('{} queries ({:+d})'.format(
+            result['queries'], result['queries'] - old['queries']))
+        if result['queries'] > old['queries']:
+            regressions.append('{} queries'.format(view))
+        lines.append('{}: {}.'.format(view, ', '.join(changes)))
+    return lines, regressions
+
+
+class Command(BaseCommand):
+    """
+    Drive the main views through the test client as the player of a
+    character, and report each view's p50 and p95 latency, query count and
+    peak allocations.  Results can be saved as a JSON baseline, and
+    compared to a saved baseline, failing if any view got worse.  Writes
+    are rolled back.  Run generate_synthetic_data first to benchmark at
+    scale.
+    """
+    help = 'Benchmark the main views and compare them to a baseline.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50,
+                            help='Timed requests to each view.')
+        parser.add_argument('--warmup', type=int, default=5,
+                            help='Untimed requests to each view first.')
+        parser.add_argument('--allocations', type=int, default=5,
+                            help='Requests to each view with allocations '
+                                 'traced.')
+        parser.add_argument('--character',
+                            help='UUID of the character to use, by default '
+                                 'the first by name.')
+        parser.add_argument('--save', metavar='PATH',
+                            help='Save the results as a baseline.')
+        parser.add_argument('--compare', metavar='PATH',
+                            help='Compare the results to a baseline.')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Fraction by which p95 latency and '
+                                 'allocations may grow.')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests must be at least 1.')
+        baseline = None
+        if options['compare']:
+            try:
+                with io.open(options['compare'], encoding='utf-8') as infile:
+                    baseline = json.load(infile)['views']
+            except (IOError, ValueError, KeyError) as err:
+                raise CommandError('Invalid baseline: {}'.format(err))
+
+        try:
+            with transaction.atomic():
+                results = self.run(options)
+                raise Rollback()
+        except Rollback:
+            pass
+
+        for view, result in results.items():
+            self.stdout.write(
+                '{}: p50 {} ms, p95 {} ms, {} queries, peak {} KiB.'.format(
+                    view, result['p50_ms'], result['p95_ms'],
+                    result['queries'], result['peak_kib']))
+
+        if options['save']:
+            baseline_json = json.dumps(OrderedDict([
+                ('requests', options['requests']),
+                ('views', results)]), indent=2)
+            with io.open(options['save'], 'w', encoding='utf-8') as out:
+                out.write(six.text_type(baseline_json))
+
+        if baseline is not None:
+            lines, regressions = compare(results, baseline,
+                                         options['tolerance'])
+            self.stdout.write('Compared to {}:'.format(options['compare']))
+            for line in lines:
+                self.stdout.write(line)
+            if regressions:
+                raise CommandError('Regressions: {}.'.format(
+                    ', '.join(regressions)))
+
+    def run(self, options):
+        """ Measure each scenario, and return the results by view."""
+        characters = Character.objects.select_related('player__user')
+        if options['character']:
+            characters = characters.filter(Char_uuid=options['character'])
+        character = characters.order_by('character_name').first()
+        spell = SpellListing.objects.order_by('name').first()
+        if character is None or spell is None:
+            raise CommandError('There must be a character and a spell; run '
+                               'generate_synthetic_data.')
+
+        client = Client()
+        try:
+            client.force_login(character.player.user)
+        except AttributeError:
+            # For Django 1.8
+            client.login(username=character.player.user.username,
+                         password=PASSWORD)
+
+        results = OrderedDict()
+        with override_settings(
+                ALLOWED_HOSTS=list(settings.ALLOWED_HOSTS) + ['testserver']):
+            for view, method, url in scenarios(character, spell):
+                if options['warmup']:
+                    measure(client, method, url, options['warmup'])
+                results[view] = measure(client, method, url,
+                                        options['requests'],
+                                        options['allocations'])
+        return results
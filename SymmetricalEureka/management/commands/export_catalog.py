@@ -0,0 +1,57 @@
+"""
+Management command to export the spell catalog.
+"""
+
+import io
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...catalog_io import CONTENT_TYPES, export_catalog
+from ...models import SpellListing, UserProfile
+
+
+class Command(BaseCommand):
+    """
+    Stream the spell catalog, or a user's starred spells, to a JSON lines
+    or CSV file that import_catalog can read back.
+    """
+    help = 'Write the spell catalog as a JSON lines or CSV file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-',
+                            help="Output file, or '-' for stdout.")
+        parser.add_argument('--format', choices=sorted(CONTENT_TYPES),
+                            help='Defaults to the extension of path, or '
+                                 'jsonl for stdout.')
+        parser.add_argument('--no-classes', action='store_false',
+                            dest='with_classes',
+                            help="Leave out each spell's classes.")
+        parser.add_argument('--starred-by', metavar='USER_NAME',
+                            help='Only export the spells starred by this '
+                                 'user.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format']
+        if fmt is None:
+            fmt = 'jsonl' if path == '-' else path.rsplit('.', 1)[-1].lower()
+        if fmt not in CONTENT_TYPES:
+            raise CommandError('Unknown catalog format "{}".'.format(fmt))
+
+        queryset = SpellListing.objects.all()
+        if options['starred_by']:
+            try:
+                profile = UserProfile.objects.get(
+                    user_name=options['starred_by'])
+            except UserProfile.DoesNotExist:
+                raise CommandError('Unknown user "{}".'.format(
+                    options['starred_by']))
+            queryset = profile.spells.all()
+
+        lines = export_catalog(queryset, fmt, options['with_classes'])
+        if path == '-':
+            for line in lines:
+                self.stdout.write(line, ending='')
+        else:
+            with io.open(path, 'w', encoding='utf-8', newline='') as out:
+                out.writelines(lines)
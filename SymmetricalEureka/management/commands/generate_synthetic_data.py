@@ -0,0 +1,44 @@
+"""
+Management command to fill the database with synthetic data.
+"""
+
+from django.core.management.base import BaseCommand
+
+from ...catalog_io import refresh_derived_data
+from ...synthetic import PASSWORD, seed_catalog, seed_users
+
+
+class Command(BaseCommand):
+    """
+    Add synthetic spells, then synthetic users with profiles, characters,
+    ability scores and stars, all written with bulk_create.  Running it
+    again adds more.
+    """
+    help = 'Add synthetic spells, users, characters and stars.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--spells', type=int, default=1000,
+                            help='Spells to add.')
+        parser.add_argument('--users', type=int, default=100,
+                            help='Users to add.')
+        parser.add_argument('--characters', type=int, default=3,
+                            help='Characters of each user.')
+        parser.add_argument('--stars', type=int, default=20,
+                            help='Spells starred by each user.')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed of the random generator.')
+
+    def handle(self, *args, **options):
+        classes = seed_catalog(options['spells'], options['seed'])
+        if options['spells']:
+            refresh_derived_data()
+        users = seed_users(options['users'], options['characters'],
+                           options['stars'], options['seed'])
+        self.stdout.write(
+            'Added {} spells with {} classes, and {} users with {} '
+            'characters and {} stars each.'.format(
+                options['spells'], classes, len(users),
+                options['characters'], options['stars']))
+        if users:
+            self.stdout.write('Users {} to {} log in with password '
+                              '"{}".'.format(users[0], users[-1], PASSWORD))
@@ -0,0 +1,56 @@
+"""
+Management command to import a spell catalog file.
+"""
+
+import io
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...catalog_io import CatalogError, import_catalog, read_csv, read_jsonl
+
+READERS = {'jsonl': read_jsonl, 'csv': read_csv}
+
+
+class Command(BaseCommand):
+    """
+    Stream a JSON lines or CSV catalog into SpellListing and SpellClasses,
+    writing only the spells that changed.
+    """
+    help = 'Create or update spells from a JSON lines or CSV catalog file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Catalog file, or '-' for stdin.")
+        parser.add_argument('--format', choices=sorted(READERS),
+                            help='Defaults to the extension of path.')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Spells written per transaction.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if fmt not in READERS:
+            raise CommandError('Unknown catalog format "{}".'.format(fmt))
+
+        if path == '-':
+            stats = self.load(READERS[fmt], sys.stdin, options['batch_size'])
+        else:
+            try:
+                with io.open(path, encoding='utf-8', newline='') as lines:
+                    stats = self.load(READERS[fmt], lines,
+                                      options['batch_size'])
+            except IOError as err:
+                raise CommandError(str(err))
+
+        self.stdout.write(
+            'Spells: {created} created, {updated} updated, {unchanged} '
+            'unchanged.  Classes: {classes_added} added, {classes_removed} '
+            'removed.'.format(**stats))
+
+    # pylint: disable=no-self-use
+    def load(self, reader, lines, batch_size):
+        """ Import the records read from lines."""
+        try:
+            return import_catalog(reader(lines), batch_size)
+        except CatalogError as err:
+            raise CommandError('Invalid catalog: {}'.format(err))
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import DatabaseError, migrations, transaction
+
+SEARCH_TABLE = 'SymmetricalEureka_spellsearch'
+SEARCH_FIELDS = ('name', 'description', 'material_components')
+
+
+def create_search_table(apps, schema_editor):
+    """
+    Create the FTS5 table used by SymmetricalEureka.search.  Databases
+    without FTS5 fall back to the in-process index, so this is a no-op there.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute(
+                'CREATE VIRTUAL TABLE {} USING fts5({})'.format(
+                    SEARCH_TABLE, ', '.join(SEARCH_FIELDS)))
+    except DatabaseError:
+        return
+    SpellListing = apps.get_model('SymmetricalEureka', 'SpellListing')
+    for row in SpellListing.objects.values_list(*SEARCH_FIELDS).iterator():
+        schema_editor.execute(
+            'INSERT INTO {} ({}) VALUES (%s, %s, %s)'.format(
+                SEARCH_TABLE, ', '.join(SEARCH_FIELDS)), row)
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS {}'.format(SEARCH_TABLE))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('SymmetricalEureka', '0008_auto_20170501_1412'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
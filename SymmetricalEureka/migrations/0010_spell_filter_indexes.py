@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 12:40
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('SymmetricalEureka', '0009_spell_search'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='spellclasses',
+            index_together=set([('caster_class', 'spell')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='spelllisting',
+            index_together=set([('level', 'school')]),
+        ),
+    ]
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def stage_references(apps, schema_editor):
+    """
+    Copy the names held by the classes and stars of each spell to columns
+    that will survive the relations being dropped.
+    """
+    qn = schema_editor.quote_name
+    SpellClasses = apps.get_model('SymmetricalEureka', 'SpellClasses')
+    UserProfile = apps.get_model('SymmetricalEureka', 'UserProfile')
+    StagedStar = apps.get_model('SymmetricalEureka', 'StagedStar')
+    Star = UserProfile.spells.through
+    schema_editor.execute('UPDATE {} SET {} = {}'.format(
+        qn(SpellClasses._meta.db_table),
+        qn(SpellClasses._meta.get_field('spell_name').column),
+        qn(SpellClasses._meta.get_field('spell').column)))
+    schema_editor.execute(
+        'INSERT INTO {staged} ({profile}, {name}) '
+        'SELECT {star_profile}, {star_spell} FROM {star}'.format(
+            staged=qn(StagedStar._meta.db_table),
+            profile=qn(StagedStar._meta.get_field('profile_id').column),
+            name=qn(StagedStar._meta.get_field('spell_name').column),
+            star=qn(Star._meta.db_table),
+            star_profile=qn(Star._meta.get_field('userprofile').column),
+            star_spell=qn(Star._meta.get_field('spelllisting').column)))
+
+
+def number_spells(apps, schema_editor):
+    """ Give the spells ids in name order."""
+    qn = schema_editor.quote_name
+    SpellListing = apps.get_model('SymmetricalEureka', 'SpellListing')
+    names = SpellListing.objects.order_by('name').values_list('name',
+                                                              flat=True)
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            'UPDATE {} SET {} = %s WHERE {} = %s'.format(
+                qn(SpellListing._meta.db_table), qn('id'), qn('name')),
+            [(i, name) for i, name in enumerate(names, 1)])
+
+
+def restore_references(apps, schema_editor):
+    """ Point the staged classes and stars at the spells' ids."""
+    qn = schema_editor.quote_name
+    SpellListing = apps.get_model('SymmetricalEureka', 'SpellListing')
+    SpellClasses = apps.get_model('SymmetricalEureka', 'SpellClasses')
+    UserProfile = apps.get_model('SymmetricalEureka', 'UserProfile')
+    StagedStar = apps.get_model('SymmetricalEureka', 'StagedStar')
+    Star = UserProfile.spells.through
+    schema_editor.execute(
+        'UPDATE {classes} SET {spell_id} = (SELECT s.{id} FROM {spell} s '
+        'WHERE s.{name} = {classes}.{spell_name})'.format(
+            classes=qn(SpellClasses._meta.db_table),
+            spell_id=qn(SpellClasses._meta.get_field('spell').column),
+            spell_name=qn(SpellClasses._meta.get_field('spell_name').column),
+            spell=qn(SpellListing._meta.db_table), id=qn('id'),
+            name=qn('name')))
+    schema_editor.execute(
+        'INSERT INTO {star} ({star_profile}, {star_spell}) '
+        'SELECT t.{profile}, s.{id} FROM {staged} t, {spell} s '
+        'WHERE s.{name} = t.{spell_name}'.format(
+            star=qn(Star._meta.db_table),
+            star_profile=qn(Star._meta.get_field('userprofile').column),
+            star_spell=qn(Star._meta.get_field('spelllisting').column),
+            staged=qn(StagedStar._meta.db_table),
+            profile=qn(StagedStar._meta.get_field('profile_id').column),
+            spell_name=qn(StagedStar._meta.get_field('spell_name').column),
+            spell=qn(SpellListing._meta.db_table), id=qn('id'),
+            name=qn('name')))
+
+
+class Migration(migrations.Migration):
+    """
+    Replace the name primary key of SpellListing with an integer id, keeping
+    name unique.  The classes and stars are staged by name while the
+    relations to SpellListing are dropped, and are pointed at the new ids
+    once it has them.  There is no way back.
+    """
+
+    dependencies = [
+        ('SymmetricalEureka', '0010_spell_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='spellclasses',
+            index_together=set([]),
+        ),
+        migrations.AddField(
+            model_name='spellclasses',
+            name='spell_name',
+            field=models.CharField(max_length=256, null=True),
+        ),
+        migrations.CreateModel(
+            name='StagedStar',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('profile_id', models.IntegerField()),
+                ('spell_name', models.CharField(max_length=256)),
+            ],
+        ),
+        migrations.RunPython(stage_references),
+        migrations.RemoveField(
+            model_name='spellclasses',
+            name='spell',
+        ),
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='spells',
+        ),
+        migrations.AddField(
+            model_name='spelllisting',
+            name='id',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.RunPython(number_spells),
+        migrations.AlterField(
+            model_name='spelllisting',
+            name='id',
+            field=models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='spelllisting',
+            name='name',
+            field=models.CharField(max_length=256, unique=True),
+        ),
+        migrations.AddField(
+            model_name='spellclasses',
+            name='spell',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='SymmetricalEureka.SpellListing'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='spells',
+            field=models.ManyToManyField(blank=True, to='SymmetricalEureka.SpellListing'),
+        ),
+        migrations.RunPython(restore_references),
+        migrations.AlterField(
+            model_name='spellclasses',
+            name='spell',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='SymmetricalEureka.SpellListing'),
+        ),
+        migrations.RemoveField(
+            model_name='spellclasses',
+            name='spell_name',
+        ),
+        migrations.DeleteModel(
+            name='StagedStar',
+        ),
+        migrations.AlterIndexTogether(
+            name='spellclasses',
+            index_together=set([('caster_class', 'spell')]),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from uuid import uuid4
+
+from django.db import migrations, models
+
+
+def create_version(apps, schema_editor):
+    """ Create the row holding the catalog version."""
+    CatalogVersion = apps.get_model('SymmetricalEureka', 'CatalogVersion')
+    CatalogVersion.objects.create(pk=1, version=uuid4().hex)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('SymmetricalEureka', '0011_spelllisting_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogVersion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(max_length=32)),
+            ],
+        ),
+        migrations.RunPython(create_version, migrations.RunPython.noop),
+    ]
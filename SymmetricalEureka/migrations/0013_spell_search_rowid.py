@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+SEARCH_TABLE = 'SymmetricalEureka_spellsearch'
+SEARCH_FIELDS = ('name', 'description', 'material_components')
+
+
+def reindex_by_id(apps, schema_editor):
+    """
+    Refill the FTS5 table used by SymmetricalEureka.search with the rowid of
+    each entry set to the id of its spell.  Databases without the table use
+    the in-process index, so this is a no-op there.
+    """
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+    if SEARCH_TABLE not in tables:
+        return
+    SpellListing = apps.get_model('SymmetricalEureka', 'SpellListing')
+    qn = schema_editor.quote_name
+    schema_editor.execute('DELETE FROM {}'.format(SEARCH_TABLE))
+    schema_editor.execute(
+        'INSERT INTO {} (rowid, {}) SELECT {}, {} FROM {}'.format(
+            SEARCH_TABLE, ', '.join(SEARCH_FIELDS),
+            qn(SpellListing._meta.pk.column), ', '.join(SEARCH_FIELDS),
+            qn(SpellListing._meta.db_table)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('SymmetricalEureka', '0012_catalogversion'),
+    ]
+
+    operations = [
+        migrations.RunPython(reindex_by_id, migrations.RunPython.noop),
+    ]
@@ -4,12 +4,14 @@
 Django Models
 """
 from __future__ import unicode_literals, division
+from collections import namedtuple
 from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.utils.encoding import python_2_unicode_compatible
 
 
@@ -34,6 +36,53 @@ def user_profile_pipeline(**kwargs):
         profile.save()
 
 
+CharacterLink = namedtuple('CharacterLink', ('character_name', 'Char_uuid'))
+
+
+class CharacterManager(models.Manager):
+    """ Manager for Character."""
+    links_key = 'SymmetricalEureka:character_links:{}'
+    links_timeout = 24 * 60 * 60
+
+    def links_for_user(self, user_id):
+        """
+        Return a CharacterLink for each of the user's characters, in name
+        order.  The list is cached until one of them is created, changed or
+        deleted.
+        """
+        key = self.links_key.format(user_id)
+        links = cache.get(key)
+        if links is None:
+            links = list(self.filter(player__user_id=user_id).order_by(
+                'character_name').values_list('character_name', 'Char_uuid'))
+            cache.set(key, links, self.links_timeout)
+        return [CharacterLink(*link) for link in links]
+
+    def forget_links(self, user_ids):
+        """ Drop the cached character lists of the users."""
+        cache.delete_many([self.links_key.format(user_id)
+                           for user_id in user_ids])
+
+    def create_with_scores(self, characters):
+        """
+        Save new characters and their ability scores, given as a list of
+        (character, [ability_scores]) pairs, in one transaction with one
+        INSERT for the characters and one for all the scores.
+        """
+        with transaction.atomic(using=self.db):
+            self.bulk_create([character for character, _ in characters])
+            scores = []
+            for character, ability_scores in characters:
+                for ability_score in ability_scores:
+                    ability_score.character = character
+                    scores.append(ability_score)
+            AbilityScores.objects.using(self.db).bulk_create(scores)
+        # bulk_create doesn't send post_save.
+        self.forget_links({character.player.user_id
+                           for character, _ in characters})
+        return [character for character, _ in characters]
+
+
 @python_2_unicode_compatible
 class Character(models.Model):
     """ Class to Hold Character Data."""
@@ -56,6 +105,8 @@ class Character(models.Model):
                                           ("NE", "Neutral Evil"),
                                           ("CE", "Chaotic Evil"),))
 
+    objects = CharacterManager()
+
     def get_absolute_url(self):
         """
         returns a string that points to the url to view this object.
@@ -87,11 +138,13 @@ class AbilityScores(models.Model):
     )
     WHICH_ENG_2_KEY = {k: v for (v, k) in WHICH_CHOICES}
     WHICH_KEY_2_ENG = {k: v for (k, v) in WHICH_CHOICES}
+    MIN_VALUE = 1
+    MAX_VALUE = 25
 
     character = models.ForeignKey(Character, on_delete=models.CASCADE)
     which = models.CharField(max_length=5, choices=WHICH_CHOICES)
     value = models.PositiveSmallIntegerField(validators=[
-        MinValueValidator(1), MaxValueValidator(25)])
+        MinValueValidator(MIN_VALUE), MaxValueValidator(MAX_VALUE)])
     proficient = models.BooleanField(default=False)
 
     @classmethod
@@ -118,6 +171,22 @@ class AbilityScores(models.Model):
             return mod + 2
         return mod
 
+    @classmethod
+    def tables(cls):
+        """
+        Return the modifier and saving throws of every valid score, for
+        pages to look up instead of calling the API.
+        """
+        scores = range(cls.MIN_VALUE, cls.MAX_VALUE + 1)
+        return {
+            'ability_score_mod': {score: cls.ability_score_mod(score)
+                                  for score in scores},
+            'abs_saving_throw': {
+                'proficient': {score: cls.abs_saving_throw(score, True)
+                               for score in scores},
+                'unproficient': {score: cls.abs_saving_throw(score, False)
+                                 for score in scores}}}
+
 
 COMPONENTS = [('', 'None'), ('V', 'Verbal'), ('S', 'Somatic'),
               ('M', 'Material'), ('VS', 'Verbal, Somatic'),
@@ -129,10 +198,18 @@ SCHOOLS = [('ab', 'Abjuration'), ('cj', 'Conjuration'), ('dv', 'Divination'),
            ('ne', 'Necromancy'), ('tr', 'Transmutation')]
 
 
+class SpellListingManager(models.Manager):
+    """ Manager for SpellListing."""
+
+    def get_by_natural_key(self, name):
+        """ Return the spell called name, for fixtures."""
+        return self.get(name=name)
+
+
 @python_2_unicode_compatible
 class SpellListing(models.Model):
     """ Class of Spell listing."""
-    name = models.CharField(max_length=256, primary_key=True)
+    name = models.CharField(max_length=256, unique=True)
     page = models.CharField(max_length=10, default='')
     spell_range = models.CharField(max_length=256, default='')
     duration = models.CharField(max_length=256, default='')
@@ -152,6 +229,15 @@ class SpellListing(models.Model):
     components = models.CharField(max_length=3, default='', choices=COMPONENTS)
     school = models.CharField(max_length=256, choices=SCHOOLS)
 
+    objects = SpellListingManager()
+
+    class Meta:
+        # For the level and school filters of SpellFilterBackend.
+        index_together = [('level', 'school')]
+
+    def natural_key(self):
+        return (self.name,)
+
     def get_level_display(self):
         if self.level == 0:
             return 'Cantrip'
@@ -170,3 +256,17 @@ class SpellClasses(models.Model):
     """ Class to contain which classes can select which spells."""
     spell = models.ForeignKey(SpellListing, on_delete=models.CASCADE)
     caster_class = models.CharField(max_length=3, choices=CASTER_CLASSES)
+
+    class Meta:
+        # Covers the spells of a class without reading the table.
+        index_together = [('caster_class', 'spell')]
+
+
+class CatalogVersion(models.Model):
+    """
+    Single row holding the version of the spell catalog, a random token
+    replaced by every write to SpellListing or SpellClasses in the same
+    transaction.  It is kept in the database so every process sees the
+    same version.
+    """
+    version = models.CharField(max_length=32)
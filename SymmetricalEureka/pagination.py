@@ -0,0 +1,17 @@
+"""
+Pagination classes for the REST API.
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class SpellCursorPagination(CursorPagination):
+    """
+    Keyset pagination over SpellListing.name.  Each page is fetched with
+    `name > last_name ORDER BY name LIMIT n`, so the cost of a page does not
+    depend on how deep into the catalog it is.
+    """
+    ordering = 'name'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
@@ -1,12 +1,16 @@
 """
-Renderers that extend bootstrap renderers.
+Renderers that extend bootstrap renderers, and a REST framework renderer
+for plain JSON.
 """
+from __future__ import unicode_literals
 
-from re import sub
+import json
 
 from django.forms import DateInput, Select, TextInput
+from django.utils import six
 
 from bootstrap3.renderers import FieldRenderer
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 
 
 class AbilityScoreFieldRenderer(FieldRenderer):
@@ -15,7 +19,7 @@ class AbilityScoreFieldRenderer(FieldRenderer):
     """
     def __init__(self, field, *args, **kwargs):
         super(AbilityScoreFieldRenderer, self).__init__(field, *args, **kwargs)
-        self.mod_id = sub(r'_', r'_mod_', self.field.id_for_label)
+        self.mod_id = self.field.id_for_label.replace('_', '_mod_')
 
     def make_input_group(self, html):
         if (self.addon_before or self.addon_after) and\
@@ -43,3 +47,37 @@ class AbilityScoreFieldRenderer(FieldRenderer):
 
     def get_label(self):
         return self.field.form.prefix.capitalize()
+
+
+class PlainJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer for responses made of dicts, lists, strings, numbers and
+    booleans only, such as lists built from values().  They are dumped by
+    the C encoder without REST framework's encoder or the check for
+    circular references.  Anything else, and indented output, is left to
+    JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or self.get_indent(accepted_media_type,
+                                           renderer_context or {}):
+            return super(PlainJSONRenderer, self).render(
+                data, accepted_media_type, renderer_context)
+        try:
+            ret = json.dumps(
+                data, ensure_ascii=self.ensure_ascii,
+                allow_nan=not self.strict, check_circular=False,
+                separators=(',', ':') if self.compact else (', ', ': '))
+        except (TypeError, ValueError):
+            return super(PlainJSONRenderer, self).render(
+                data, accepted_media_type, renderer_context)
+        # As JSONRenderer does, for JavaScript.
+        if isinstance(ret, six.text_type):
+            ret = ret.replace('\u2028', '\\u2028').replace(
+                '\u2029', '\\u2029')
+            return bytes(ret.encode('utf-8'))
+        return ret
+
+
+# For read only list endpoints.
+LIST_RENDERERS = (PlainJSONRenderer, BrowsableAPIRenderer)
@@ -0,0 +1,245 @@
+"""
+Full text search over the spell catalog.
+
+Spells are indexed on name, description and material_components, and their
+entries are keyed by the spell's id, so a renamed spell is found under its
+new name only.  When the database is SQLite with FTS5 compiled in, the index
+is the virtual table created by migration 0009 and lives in the same
+transaction as the catalog.  Otherwise a pure Python inverted index is built
+from the catalog on first use, updated in place by the signal handlers in
+signals.py, and built again when the catalog version is changed by another
+process.
+"""
+
+from __future__ import division, unicode_literals
+
+import math
+import re
+from bisect import bisect_left, insort
+from collections import defaultdict
+from threading import RLock
+
+from django.db import connection, transaction
+
+from .bulk import MAX_QUERY_PARAMS, chunks
+from .catalog import get_catalog_version
+from .models import SpellListing
+
+SEARCH_TABLE = 'SymmetricalEureka_spellsearch'
+SEARCH_FIELDS = ('name', 'description', 'material_components')
+# Relative weight of a match in each of SEARCH_FIELDS.
+FIELD_WEIGHTS = (10.0, 1.0, 1.0)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    """ Split text into lower case search terms."""
+    return [token.lower() for token in TOKEN_RE.findall(text)]
+
+
+def _copy_sql(where=''):
+    """
+    Return an INSERT ... SELECT that copies the spells matching where into
+    the FTS5 table, with the rowid of each entry set to the spell's id.
+    """
+    qn = connection.ops.quote_name
+    return 'INSERT INTO {} (rowid, {}) SELECT {}, {} FROM {}{}'.format(
+        SEARCH_TABLE, ', '.join(SEARCH_FIELDS),
+        qn(SpellListing._meta.pk.column), ', '.join(SEARCH_FIELDS),
+        qn(SpellListing._meta.db_table), where)
+
+
+class FTS5SpellIndex(object):
+    """
+    Search index stored in an SQLite FTS5 virtual table, whose rowids are the
+    ids of the spells.
+    """
+
+    # pylint: disable=no-self-use,unused-argument
+    def update(self, pks, old_version=None, version=None):
+        """
+        Bring the entries of the spells with ids pks up to date with the
+        catalog, adding, replacing or removing each as needed.  The table is
+        in the database, so the catalog versions of the write don't matter.
+        """
+        if not pks:
+            return
+        with transaction.atomic(), connection.cursor() as cursor:
+            for chunk in chunks(set(pks), MAX_QUERY_PARAMS):
+                params = ', '.join(['%s'] * len(chunk))
+                cursor.execute('DELETE FROM {} WHERE rowid IN ({})'.format(
+                    SEARCH_TABLE, params), chunk)
+                cursor.execute(_copy_sql(' WHERE {} IN ({})'.format(
+                    connection.ops.quote_name(SpellListing._meta.pk.column),
+                    params)), chunk)
+
+    def rebuild(self):
+        """ Replace the contents of the index with the current catalog."""
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('DELETE FROM {}'.format(SEARCH_TABLE))
+            cursor.execute(_copy_sql())
+
+    def search(self, query, limit):
+        """ Return up to limit spell names matching query, best first."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        match = ' '.join('"{}"*'.format(token) for token in tokens)
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT s.{name} FROM {0} JOIN {spell} s ON s.{pk} = {0}.rowid '
+                'WHERE {0} MATCH %s ORDER BY bm25({0}, {1}) LIMIT %s'.format(
+                    SEARCH_TABLE, ', '.join(str(w) for w in FIELD_WEIGHTS),
+                    name=qn(SpellListing._meta.get_field('name').column),
+                    spell=qn(SpellListing._meta.db_table),
+                    pk=qn(SpellListing._meta.pk.column)),
+                [match, limit])
+            return [row[0] for row in cursor.fetchall()]
+
+
+class TokenSpellIndex(object):
+    """
+    In-process inverted index from search terms to spell ids.  Each query
+    term matches every indexed term it is a prefix of, and results are ranked
+    by BM25 over field weighted term frequencies, as FTS5 does.  The index
+    is built for a catalog version, follows the writes made in this process,
+    and is built again once the version changes any other way.
+    """
+    k_1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._lock = RLock()
+        self._version = None
+        self._names = {}
+        self._documents = {}
+        self._lengths = {}
+        self._total_length = 0.0
+        self._postings = defaultdict(dict)
+        self._terms = []
+
+    def _index_terms(self, spell):
+        """ Return the weighted term frequencies of spell."""
+        weights = defaultdict(float)
+        for field, weight in zip(SEARCH_FIELDS, FIELD_WEIGHTS):
+            for token in tokenize(getattr(spell, field)):
+                weights[token] += weight
+        return weights
+
+    def _add(self, spell):
+        weights = self._index_terms(spell)
+        for term, weight in weights.items():
+            if term not in self._postings:
+                insort(self._terms, term)
+            self._postings[term][spell.pk] = weight
+        self._names[spell.pk] = spell.name
+        self._documents[spell.pk] = list(weights)
+        self._lengths[spell.pk] = sum(weights.values())
+        self._total_length += self._lengths[spell.pk]
+
+    def _remove(self, pk):
+        self._names.pop(pk, None)
+        self._total_length -= self._lengths.pop(pk, 0.0)
+        for term in self._documents.pop(pk, []):
+            postings = self._postings[term]
+            del postings[pk]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+
+    def _ensure_built(self):
+        if self._version != get_catalog_version():
+            self.rebuild()
+
+    def _prefixed(self, token):
+        """ Yield every indexed term that starts with token."""
+        i = bisect_left(self._terms, token)
+        while i < len(self._terms) and self._terms[i].startswith(token):
+            yield self._terms[i]
+            i += 1
+
+    def _score_term(self, term, scores):
+        """ Add the BM25 score of term for each document to scores."""
+        postings = self._postings[term]
+        count = len(self._documents)
+        idf = math.log(1 + (count - len(postings) + 0.5) /
+                       (len(postings) + 0.5))
+        average = self._total_length / count
+        for pk, freq in postings.items():
+            norm = 1 - self.b + self.b * self._lengths[pk] / average
+            scores[pk] += idf * freq * (self.k_1 + 1) / (
+                freq + self.k_1 * norm)
+
+    def update(self, pks, old_version, version):
+        """
+        Bring the entries of the spells with ids pks up to date after a write
+        that moved the catalog from old_version to version.  If the index
+        wasn't built at old_version, it missed other writes, and is left to
+        be built again on the next search.
+        """
+        with self._lock:
+            if self._version is None or self._version != old_version:
+                return
+            for pk in pks:
+                self._remove(pk)
+            for chunk in chunks(set(pks), MAX_QUERY_PARAMS):
+                for spell in SpellListing.objects.filter(
+                        pk__in=chunk).only(*SEARCH_FIELDS):
+                    self._add(spell)
+            self._version = version
+
+    def rebuild(self):
+        """ Replace the contents of the index with the current catalog."""
+        with self._lock:
+            version = get_catalog_version()
+            self._names.clear()
+            self._documents.clear()
+            self._lengths.clear()
+            self._total_length = 0.0
+            self._postings.clear()
+            del self._terms[:]
+            for spell in SpellListing.objects.only(
+                    *SEARCH_FIELDS).iterator():
+                self._add(spell)
+            self._version = version
+
+    def search(self, query, limit):
+        """ Return up to limit spell names matching query, best first."""
+        with self._lock:
+            self._ensure_built()
+            scores = None
+            for token in tokenize(query):
+                matches = defaultdict(float)
+                for term in self._prefixed(token):
+                    self._score_term(term, matches)
+                if scores is None:
+                    scores = matches
+                else:
+                    scores = {pk: score + matches[pk]
+                              for pk, score in scores.items()
+                              if pk in matches}
+                if not scores:
+                    return []
+            if scores is None:
+                return []
+            ranked = sorted((-score, self._names[pk])
+                            for pk, score in scores.items())
+        return [name for _, name in ranked[:limit]]
+
+
+# pylint: disable=invalid-name
+_search_index = None
+
+
+def get_search_index():
+    """ Return the search index for the default database."""
+    # pylint: disable=global-statement
+    global _search_index
+    if _search_index is None:
+        if SEARCH_TABLE in connection.introspection.table_names():
+            _search_index = FTS5SpellIndex()
+        else:
+            _search_index = TokenSpellIndex()
+    return _search_index
@@ -1,18 +1,82 @@
 # pylint: disable=missing-docstring
 
+from collections import OrderedDict
+
 from rest_framework import serializers
 
-from .models import SpellListing, SpellClasses
+from .instrumentation import TimedSerializerMixin, timer
+from .models import (AbilityScores, Character, COMPONENTS, SCHOOLS,
+                     SpellListing)
+
+SCHOOL_NAMES = dict(SCHOOLS)
+COMPONENT_NAMES = dict(COMPONENTS)
+
+
+class ValuesSerializerMixin(object):
+    """
+    Mixin for read only ModelSerializers whose fields are all columns, or
+    functions of a column given in `value_converters`.  from_values() builds
+    the payloads straight from the rows of queryset.values(), without going
+    through a field object for every value, for list endpoints.  Passing
+    `fields` to the serializer, or to from_values(), keeps only those fields.
+    """
+    value_converters = {}
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super(ValuesSerializerMixin, self).__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def value_fields(cls):
+        """ Return the names of the fields, in the serializer's order."""
+        if '_value_fields' not in cls.__dict__:
+            cls._value_fields = tuple(cls().fields)
+        return cls._value_fields
 
+    @classmethod
+    def from_values(cls, rows, fields=None):
+        """
+        Return the payload of each row of queryset.values(*value_fields()),
+        the same as serializing the instances would.  If fields is given,
+        the payloads have only those fields, and the rows need only those
+        columns.
+        """
+        converters = [(name, cls.value_converters.get(name))
+                      for name in (cls.value_fields() if fields is None
+                                   else fields)]
+        with timer('serializer'):
+            return [OrderedDict(
+                (name, row[name] if convert is None else convert(row[name]))
+                for name, convert in converters) for row in rows]
 
-class SpellListingSerializer(serializers.ModelSerializer):
+
+def sparse_payload(payload, fields):
+    """ Return payload with only fields, or all of it if fields is None."""
+    if fields is None:
+        return payload
+    return OrderedDict((name, payload[name]) for name in fields)
+
+
+class SpellListingSerializer(ValuesSerializerMixin, TimedSerializerMixin,
+                             serializers.ModelSerializer):
     school = serializers.SerializerMethodField()
     components = serializers.SerializerMethodField()
     level = serializers.SerializerMethodField()
 
+    # The same as the get_*_display methods.
+    value_converters = {
+        'school': lambda school: SCHOOL_NAMES.get(school, school),
+        'components': lambda components: COMPONENT_NAMES.get(components,
+                                                             components),
+        'level': lambda level: 'Cantrip' if level == 0 else level,
+    }
+
     class Meta:
         model = SpellListing
-        fields = '__all__'
+        exclude = ('id',)
 
     # pylint: disable=no-self-use
     def get_school(self, obj):
@@ -25,7 +89,49 @@ class SpellListingSerializer(serializers.ModelSerializer):
         return obj.get_level_display()
 
 
-class SpellClassesSerializer(serializers.ModelSerializer):
+class AbilityScoresSerializer(serializers.Serializer):
+    """ The six ability scores of a new character, by name."""
+    # pylint: disable=abstract-method
+
+    def get_fields(self):
+        return OrderedDict(
+            (name, serializers.IntegerField(
+                min_value=AbilityScores.MIN_VALUE,
+                max_value=AbilityScores.MAX_VALUE))
+            for _, name in AbilityScores.WHICH_CHOICES)
+
+
+class CharacterListSerializer(serializers.ListSerializer):
+    """ Creates all of the characters with two INSERTs."""
+
+    def create(self, validated_data):
+        return Character.objects.create_with_scores(
+            [self.child.build(attrs) for attrs in validated_data])
+
+
+class CharacterSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    ability_scores = AbilityScoresSerializer(write_only=True)
+    url = serializers.SerializerMethodField()
+
     class Meta:
-        model = SpellClasses
-        fields = ('spell', )
+        model = Character
+        fields = ('Char_uuid', 'character_name', 'alignment',
+                  'ability_scores', 'url')
+        list_serializer_class = CharacterListSerializer
+
+    # pylint: disable=no-self-use
+    def get_url(self, obj):
+        return obj.get_absolute_url()
+
+    def build(self, attrs):
+        """ Return the unsaved character and ability scores in attrs."""
+        attrs = dict(attrs)
+        ability_scores = [
+            AbilityScores(which=AbilityScores.WHICH_ENG_2_KEY[name],
+                          value=value)
+            for name, value in attrs.pop('ability_scores').items()]
+        return Character(**attrs), ability_scores
+
+    def create(self, validated_data):
+        return Character.objects.create_with_scores(
+            [self.build(validated_data)])[0]
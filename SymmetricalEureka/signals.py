@@ -0,0 +1,44 @@
+"""
+Signal handlers that keep derived and cached data in step with the database.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import spell_cache
+from .catalog import bump_catalog_version
+from .models import Character, SpellClasses, SpellListing, UserProfile
+from .search import get_search_index
+
+
+# pylint: disable=unused-argument
+@receiver(post_save, sender=SpellListing)
+@receiver(post_delete, sender=SpellListing)
+def drop_cached_spells(sender, **kwargs):
+    """
+    Drop the serialized spells held by this process.  Other processes stop
+    using theirs once the catalog version is bumped.
+    """
+    spell_cache.clear_local()
+
+
+@receiver(post_save, sender=SpellListing)
+@receiver(post_delete, sender=SpellListing)
+@receiver(post_save, sender=SpellClasses)
+@receiver(post_delete, sender=SpellClasses)
+def catalog_changed(sender, instance, **kwargs):
+    """
+    Bump the catalog version on any write to the catalog, and update the
+    search index entry of a written spell.
+    """
+    old_version, version = bump_catalog_version()
+    pks = [instance.pk] if sender is SpellListing else []
+    get_search_index().update(pks, old_version, version)
+
+
+@receiver(post_save, sender=Character)
+@receiver(post_delete, sender=Character)
+def character_changed(sender, instance, **kwargs):
+    """ Drop the cached character list of the character's player."""
+    Character.objects.forget_links(UserProfile.objects.filter(
+        pk=instance.player_id).values_list('user_id', flat=True))
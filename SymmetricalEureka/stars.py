@@ -0,0 +1,97 @@
+"""
+Starring and unstarring spells for a user with one statement per request.
+
+The writes go straight to the UserProfile.spells through table, so no
+m2m_changed signals are sent.
+"""
+
+from django.db import IntegrityError, connection, transaction
+
+from .bulk import MAX_QUERY_PARAMS, chunks
+from .models import SpellListing, UserProfile
+
+# pylint: disable=invalid-name
+Star = UserProfile.spells.through
+
+
+def _star_sql(count):
+    """
+    Return an INSERT ... SELECT that stars count spells, by name, for the
+    user passed as the first parameter, skipping spells already starred.
+    """
+    # pylint: disable=protected-access
+    qn = connection.ops.quote_name
+    return (
+        'INSERT INTO {star} ({star_profile}, {star_spell}) '
+        'SELECT p.{profile_pk}, s.{spell_pk} FROM {profile} p, {spell} s '
+        'WHERE p.{user} = %s AND s.{name} IN ({names}) AND NOT EXISTS ('
+        'SELECT 1 FROM {star} t WHERE t.{star_profile} = p.{profile_pk} '
+        'AND t.{star_spell} = s.{spell_pk})').format(
+            star=qn(Star._meta.db_table),
+            star_profile=qn(Star._meta.get_field('userprofile').column),
+            star_spell=qn(Star._meta.get_field('spelllisting').column),
+            profile=qn(UserProfile._meta.db_table),
+            profile_pk=qn(UserProfile._meta.pk.column),
+            user=qn(UserProfile._meta.get_field('user').column),
+            spell=qn(SpellListing._meta.db_table),
+            spell_pk=qn(SpellListing._meta.pk.column),
+            name=qn(SpellListing._meta.get_field('name').column),
+            names=', '.join(['%s'] * count))
+
+
+def _unstar_sql(count):
+    """
+    Return a DELETE that unstars count spells, by name, for the user passed
+    as the first parameter.
+    """
+    # pylint: disable=protected-access
+    qn = connection.ops.quote_name
+    return (
+        'DELETE FROM {star} WHERE {star_profile} IN ('
+        'SELECT {profile_pk} FROM {profile} WHERE {user} = %s) '
+        'AND {star_spell} IN ('
+        'SELECT {spell_pk} FROM {spell} WHERE {name} IN ({names}))').format(
+            star=qn(Star._meta.db_table),
+            star_profile=qn(Star._meta.get_field('userprofile').column),
+            star_spell=qn(Star._meta.get_field('spelllisting').column),
+            profile=qn(UserProfile._meta.db_table),
+            profile_pk=qn(UserProfile._meta.pk.column),
+            user=qn(UserProfile._meta.get_field('user').column),
+            spell=qn(SpellListing._meta.db_table),
+            spell_pk=qn(SpellListing._meta.pk.column),
+            name=qn(SpellListing._meta.get_field('name').column),
+            names=', '.join(['%s'] * count))
+
+
+def star_spells(user, names):
+    """
+    Star the spells called names for user, and return how many weren't
+    already starred.  Names of spells that don't exist are ignored.
+    """
+    starred = 0
+    for chunk in chunks(set(names), MAX_QUERY_PARAMS - 1):
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(_star_sql(len(chunk)), [user.pk] + chunk)
+                starred += cursor.rowcount
+        except IntegrityError:
+            # A concurrent request starred some of them first.
+            starred += star_spells(user, chunk)
+    return starred
+
+
+def unstar_spells(user, names):
+    """ Unstar the spells called names for user, and return how many were."""
+    unstarred = 0
+    for chunk in chunks(set(names), MAX_QUERY_PARAMS - 1):
+        # QuerySet.delete() doesn't return a count before Django 1.9.
+        with connection.cursor() as cursor:
+            cursor.execute(_unstar_sql(len(chunk)), [user.pk] + chunk)
+            unstarred += cursor.rowcount
+    return unstarred
+
+
+def is_starred(user, name):
+    """ Return whether user has starred the spell called name."""
+    return Star.objects.filter(userprofile__user=user,
+                               spelllisting__name=name).exists()
@@ -1,5 +1,5 @@
 /*jslint browser: true*/
-/*global $, document*/
+/*global $, document, ability_score_tables, ability_scores_url*/
 
 function get_csrf_token() {
     var cookie = document.cookie;
@@ -23,6 +23,15 @@ function adjust_mod(data, mod_id) {
     $("#" + mod_id).text(mod);
 }
 
+function adjust_tabled_mod(value, proficient, mod_id, sav_id) {
+    var saving_throws = ability_score_tables.abs_saving_throw[
+        proficient ? "proficient" : "unproficient"];
+    if(ability_score_tables.ability_score_mod.hasOwnProperty(value)) {
+        adjust_mod(ability_score_tables.ability_score_mod[value], mod_id);
+        adjust_mod(saving_throws[value], sav_id);
+    }
+}
+
 function toggle_fieldset() {
     $(this).parent().toggleClass('toggle-border');
     $(this).siblings().toggle();
@@ -36,13 +45,7 @@ function get_ability_score_mod() {
     var mod_id = this.id.replace("_", "_mod_");
     var sav_id = this.id.replace("_", "_sav_").replace("-value", "");
 
-    $.get("http://degustaf.pythonanywhere.com/SymmetricalEureka/api/AbilityScores/ability_score_mod",
-            {"ability_score": value, "proficient": proficient})
-        .done( function(data) {
-            adjust_mod(data.ability_score_mod, mod_id);
-            adjust_mod(data.abs_saving_throw, sav_id);
-        })
-        .fail();
+    adjust_tabled_mod(value, proficient, mod_id, sav_id);
 }
 
 function toggle_p_with_input() {
@@ -54,24 +57,25 @@ function update_ability_score() {
     var ability_score = $(this).attr("name");
     var mod_id = this.id.replace("_", "_mod_");
     var sav_id = this.id.replace("_", "_sav_");
-    var url = "http://degustaf.pythonanywhere.com/SymmetricalEureka/api/" + $("#uuid").text() + "/AbilityScores/" + ability_score;
+    var proficient = $("#" + this.id.replace("_", "_sav_prof_")).hasClass("proficient");
+    var url = ability_scores_url + ability_score;
     var p_elmnt = $("p#id_" + ability_score);
     var input_elmnt = $("input#id_" + ability_score);
 
     var post_data = {'csrfmiddlewaretoken': get_csrf_token(),
                      'value': $(this).val()};
 
+    adjust_tabled_mod($(this).val(), proficient, mod_id, sav_id);
     $.post(url, post_data)
         .done(function(data) {
-            adjust_mod(data.ability_score_mod, mod_id);
-            adjust_mod(data.saving_throw, sav_id);
+            p_elmnt.text(data[ability_score]);
         })
         .fail(function() {
-            input_elmnt.val(p_elmnt.val());
+            adjust_tabled_mod(p_elmnt.text(), proficient, mod_id, sav_id);
         })
-        .always(function(data) {
-            p_elmnt.text(data[ability_score]).removeClass('invisible');
-            input_elmnt.val(data[ability_score]).addClass('invisible');
+        .always(function() {
+            p_elmnt.removeClass('invisible');
+            input_elmnt.val(p_elmnt.text()).addClass('invisible');
         });
 }
 
@@ -81,8 +81,11 @@ function ajax_modal() {
 		var cell=$(evt.target).closest('td');
 		var name = $(this).find(".name").text();
 		if( cell.index()===0){
-			var post_data = {'csrfmiddlewaretoken': get_csrf_token()};
-			$.post(userspell_url + encodeURI(name), post_data).done(userspell_callback(cell));
+			var starred = cell.children("span.glyphicon").hasClass("glyphicon-star");
+			$.ajax({url: userspell_url + encodeURI(name),
+					type: starred ? "DELETE" : "PUT",
+					headers: {"X-CSRFToken": get_csrf_token()}})
+				.done(userspell_callback(cell));
 		}else{
 			$.get(api_url + encodeURI(name)).done(build_modal);
 		}
@@ -0,0 +1,129 @@
+"""
+Synthetic data for benchmarks.
+
+Spells, users and their characters and stars are drawn from seeded random
+generators, so the same arguments always give the same data, with levels,
+schools and classes spread over every choice roughly as evenly as in the
+published catalog.  Names are numbered on from the synthetic rows already
+in the database, so seeding again adds more rows.
+"""
+
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from .bulk import chunks
+from .models import (CASTER_CLASSES, COMPONENTS, SCHOOLS, AbilityScores,
+                     Character, SpellClasses, SpellListing, UserProfile)
+
+SPELL_PREFIX = 'Synthetic Spell '
+USER_PREFIX = 'synthetic'
+# Synthetic users can log in with this password.
+PASSWORD = 'synthetic'
+ALIGNMENTS = [alignment for alignment, _ in
+              Character._meta.get_field('alignment').choices]
+
+
+def synthetic_spells(count, seed=0, start=0):
+    """
+    Yield count pairs of an unsaved SpellListing and the list of the
+    CASTER_CLASSES keys that can cast it, numbering the spells from start.
+    """
+    rand = random.Random(seed + start)
+    classes = [cls for cls, _ in CASTER_CLASSES]
+    for i in range(start, start + count):
+        spell = SpellListing(
+            name='{}{:06d}'.format(SPELL_PREFIX, i),
+            level=rand.randint(0, 9),
+            school=rand.choice(SCHOOLS)[0],
+            components=rand.choice(COMPONENTS)[0],
+            ritual=rand.random() < 0.1,
+            concentration=rand.random() < 0.4,
+            casting_time='1 action',
+            spell_range='{} feet'.format(rand.choice((5, 30, 60, 120))),
+            duration='Instantaneous',
+            page='phb {}'.format(rand.randint(200, 290)),
+            description=' '.join(rand.choice(('arcane', 'fire', 'radiant',
+                                              'ward', 'storm', 'shadow'))
+                                 for _ in range(rand.randint(10, 60))))
+        yield spell, rand.sample(classes, rand.randint(1, 4))
+
+
+def seed_catalog(count, seed=0, batch_size=500):
+    """
+    Add count synthetic spells, and their SpellClasses, to the database in
+    batches of batch_size.  Returns the number of SpellClasses created.
+    The model signals aren't sent, so callers that keep the spells must
+    call catalog_io.refresh_derived_data().
+    """
+    start = SpellListing.objects.filter(
+        name__startswith=SPELL_PREFIX).count()
+    created = 0
+    for batch in chunks(synthetic_spells(count, seed, start), batch_size):
+        with transaction.atomic():
+            SpellListing.objects.bulk_create([spell for spell, _ in batch])
+            pks = dict(SpellListing.objects.filter(
+                name__in=[spell.name for spell, _ in batch]).values_list(
+                    'name', 'pk'))
+            spell_classes = [SpellClasses(spell_id=pks[spell.name],
+                                          caster_class=cls)
+                             for spell, classes in batch for cls in classes]
+            SpellClasses.objects.bulk_create(spell_classes)
+        created += len(spell_classes)
+    return created
+
+
+def _seed_users(batch, rand, password, spell_ids, characters, stars):
+    """ Save a batch of users with their profiles, characters and stars."""
+    User = get_user_model()  # pylint: disable=invalid-name
+    User.objects.bulk_create([User(username=name, password=password)
+                              for name in batch])
+    user_ids = dict(User.objects.filter(username__in=batch).values_list(
+        'username', 'pk'))
+    UserProfile.objects.bulk_create([
+        UserProfile(user_id=user_ids[name], user_name=name)
+        for name in batch])
+    profiles = list(UserProfile.objects.filter(
+        user_name__in=batch).order_by('user_name'))
+
+    abilities = [which for which, _ in AbilityScores.WHICH_CHOICES]
+    new_characters = []
+    for profile in profiles:
+        for i in range(characters):
+            proficient = rand.sample(abilities, 2)
+            new_characters.append((
+                Character(player=profile, alignment=rand.choice(ALIGNMENTS),
+                          character_name='{} {}'.format(profile.user_name,
+                                                        i)),
+                [AbilityScores(which=which, value=rand.randint(3, 18),
+                               proficient=which in proficient)
+                 for which in abilities]))
+    Character.objects.create_with_scores(new_characters)
+
+    Star = UserProfile.spells.through  # pylint: disable=invalid-name
+    Star.objects.bulk_create([
+        Star(userprofile_id=profile.pk, spelllisting_id=spell_id)
+        for profile in profiles
+        for spell_id in rand.sample(spell_ids, min(stars, len(spell_ids)))])
+
+
+def seed_users(count, characters=3, stars=20, seed=0, batch_size=200):
+    """
+    Add count users, each with a UserProfile, characters characters with
+    all six ability scores, and stars of that many random spells, in
+    batches of batch_size users.  Returns the names of the users.
+    """
+    User = get_user_model()  # pylint: disable=invalid-name
+    start = User.objects.filter(username__startswith=USER_PREFIX).count()
+    rand = random.Random(seed + start)
+    password = make_password(PASSWORD)
+    spell_ids = list(SpellListing.objects.order_by('pk').values_list(
+        'pk', flat=True))
+    names = ['{}{:06d}'.format(USER_PREFIX, i)
+             for i in range(start, start + count)]
+    for batch in chunks(names, batch_size):
+        with transaction.atomic():
+            _seed_users(batch, rand, password, spell_ids, characters, stars)
+    return names
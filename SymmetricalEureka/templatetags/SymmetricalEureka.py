@@ -2,9 +2,12 @@
 Specialized template tags.
 """
 
+import json
 
 from django import template
-from django.utils.html import format_html
+from django.utils import six
+from django.utils.html import conditional_escape, escape, format_html
+from django.utils.safestring import mark_safe
 
 from bootstrap3.forms import render_field
 
@@ -29,59 +32,106 @@ def _bs_ability_score_field(*args, **kwargs):
     return render_field(*args, **kwargs)
 
 
-def _bs_ability_score_display(ability_score):
+class WhichTemplate(object):
     """
-    Render an html element to display field.
+    An HTML format string for one ability score.  The parts that depend only
+    on which score it is are filled in once per `which`, leaving a format
+    string for the values that change.
     """
-    # pylint: disable=protected-access
-    field = AbilityScores.WHICH_KEY_2_ENG[ability_score.which]
-    val = ability_score.value
-    mod = "{:+d}".format(AbilityScores.ability_score_mod(val))
 
-    html = format_html("""<div class="col-sm-2 col-xs-4 ability-score-block value-block">
+    def __init__(self, template):
+        self.template = template
+        self.compiled = {}
+
+    def compile(self, which):
+        """ Return the template with the static parts for which filled in."""
+        try:
+            return self.compiled[which]
+        except KeyError:
+            field = AbilityScores.WHICH_KEY_2_ENG[which]
+            compiled = self.template.format(label=escape(field.capitalize()),
+                                            name=escape(field))
+            self.compiled[which] = compiled
+            return compiled
+
+    def render(self, which, **values):
+        """
+        Render the template for which with values escaped.  Integers need no
+        escaping, and are passed through for the template to format.
+        """
+        return mark_safe(self.compile(which).format(
+            **{key: value if isinstance(value, six.integer_types)
+               else conditional_escape(value)
+               for key, value in values.items()}))
+
+
+ABILITY_SCORE_DISPLAY = WhichTemplate(
+    """<div class="col-sm-2 col-xs-4 ability-score-block value-block">
                     <div>
                         <label class="control-label" for="id_{name}">
-                            {}
+                            {label}
                         </label>
-                    <p class="ability-score" id="id_{name}">{val}</p>
+                    <p class="ability-score" id="id_{name}">{{val}}</p>
                     <input class="form-control invisible" id="id_{name}"
                         min="0" name="{name}" title="" type="number"
-                        value={val}>
+                        value={{val}}>
+                    <div class="as-mod-padding">
+                        <p class="ability-score-mod badge" id="id_mod_{name}">{{mod:+d}}
+                </p></div></div></div>""")
+
+SAVING_THROW_DISPLAY = WhichTemplate(
+    """<div class="col-sm-2 col-xs-4 value-block">
+                    <div>
+                        <label class="control-label" for="id_sav_{name}">
+                            {label}
+                        </label>
+                    <p class="sav-score" id="id_sav_{name}">{{val}}</p>
                     <div class="as-mod-padding">
-                        <p class="{}" id="id_mod_{name}">{}
-                </p></div></div></div>""",
-                       field.capitalize(),
-                       "ability-score-mod badge",
-                       mod,
-                       val=val,
-                       name=field)
-    return html
+                        <p class="{{prof}}" id="id_sav_prof_{name}"></p>
+                    </div></div></div>""")
+
+
+PROFICIENT = mark_safe("proficient")
+UNPROFICIENT = mark_safe("unproficient")
+
+
+def _bs_ability_score_display(ability_score):
+    """
+    Render an html element to display field.
+    """
+    val = ability_score.value
+    return ABILITY_SCORE_DISPLAY.render(
+        ability_score.which, val=val,
+        mod=AbilityScores.ability_score_mod(val))
 
 
 def _bs_saving_throw_display(ability_score):
     """
     Render an html element to display field.
     """
-    # pylint: disable=protected-access
-    field = AbilityScores.WHICH_KEY_2_ENG[ability_score.which]
     val = "{:+d}".format(ability_score.saving_throw)\
         if ability_score.value else ""
-    prof = "proficient" if ability_score.proficient else "unproficient"
+    prof = PROFICIENT if ability_score.proficient else UNPROFICIENT
+    return SAVING_THROW_DISPLAY.render(ability_score.which, val=val,
+                                       prof=prof)
 
-    html = format_html("""<div class="col-sm-2 col-xs-4 value-block">
-                    <div>
-                        <label class="control-label" for="id_sav_{name}">
-                            {}
-                        </label>
-                    <p class="sav-score" id="id_sav_{name}">{val}</p>
-                    <div class="as-mod-padding">
-                        <p class="{}" id="id_sav_prof_{name}"></p>
-                    </div></div></div>""",
-                       field.capitalize(),
-                       prof,
-                       val=val,
-                       name=field)
-    return html
+
+_ABILITY_SCORE_TABLES = None
+
+
+def _ability_score_tables():
+    """
+    Render a script defining ability_score_tables, the tables of
+    AbilityScores.tables() as JSON.  The tables never change, so they are
+    rendered once.
+    """
+    # pylint: disable=global-statement
+    global _ABILITY_SCORE_TABLES
+    if _ABILITY_SCORE_TABLES is None:
+        _ABILITY_SCORE_TABLES = format_html(
+            '<script>var ability_score_tables = {};</script>',
+            mark_safe(json.dumps(AbilityScores.tables(), sort_keys=True)))
+    return _ABILITY_SCORE_TABLES
 
 
 # pylint: disable=invalid-name
@@ -104,3 +154,9 @@ def bs_ability_score_display(ability_score):
 def bs_saving_throw_display(ability_score):
     """ Wrapper around _bs_saving_throw_display for templates."""
     return _bs_saving_throw_display(ability_score)
+
+
+@register.simple_tag
+def ability_score_tables():
+    """ Wrapper around _ability_score_tables for templates."""
+    return _ability_score_tables()
@@ -6,6 +6,7 @@ from django.contrib import admin
 from django.contrib.auth import urls as auth_urls
 from social_django import urls as social_urls
 from SymmetricalEureka import views
+from SymmetricalEureka.instrumentation import instrumented
 
 
 admin.autodiscover()
@@ -18,22 +19,56 @@ urlpatterns = [
     url(r'^$', views.HomeView.as_view(), name='SE_home'),
     url(r'^login/$', views.LoginView.as_view(), name='SE_login'),
     url(r'^character/(?P<Char_uuid>{})/$'.format(char_uuid_regex),
-        views.DisplayCharacterView.as_view(), name='SE_character'),
+        instrumented(views.DisplayCharacterView.as_view()),
+        name='SE_character'),
     url(r'^new_character/', views.NewCharacterView.as_view(),
         name='new_character'),
+    url(r'^api/characters/$',
+        instrumented(views.CharacterCreateView.as_view()),
+        name='SE_characters'),
+    url(r'^api/(?P<model>{})/(?P<method>{})/batch$'.format(
+        model_regex, attribute_regex),
+        instrumented(views.ClassMethodBatchView.as_view()),
+        name='SE_ClassMethodBatch'),
     url(r'^api/(?P<model>{})/(?P<method>{})$'.format(
         model_regex, attribute_regex),
-        views.ClassMethodView.as_view(), name='SE_ClassMethod'),
+        instrumented(views.ClassMethodView.as_view()),
+        name='SE_ClassMethod'),
+    url(r'^api/(?P<Char_uuid>{})/AbilityScores/$'.format(char_uuid_regex),
+        instrumented(views.CharacterAbilityScoresView.as_view()),
+        name='SE_character_scores'),
     url(r'^api/(?P<Char_uuid>{})/AbilityScores/(?P<attribute>{})$'.format(
         char_uuid_regex, attribute_regex),
-        views.CharacterAtributeView.as_view(), name='SE_character_method'),
-    url(r'^spells/$', views.SpellListView.as_view(), name='SE_spell_list'),
-    url(r'^api/spells/(?P<pk>.*)', views.UserSpellView.as_view(),
-        name='UserSpell'),
-    url(r'^spells/(?P<pk>.+)$', views.SpellListDetail.as_view(),
+        instrumented(views.CharacterAtributeView.as_view()),
+        name='SE_character_method'),
+    url(r'^spells/$', instrumented(views.SpellListView.as_view()),
+        name='SE_spell_list'),
+    url(r'^api/spell_export\.(?P<fmt>jsonl|csv)$',
+        instrumented(views.SpellExportView.as_view()),
+        name='SE_spell_export'),
+    url(r'^api/spell_list/$', instrumented(views.SpellListAPIView.as_view()),
+        name='SE_spell_list_api'),
+    url(r'^api/spell_catalog/$',
+        instrumented(views.SpellCatalogView.as_view()),
+        name='SE_spell_catalog'),
+    url(r'^api/spell_details/$',
+        instrumented(views.SpellDetailBatchView.as_view()),
+        name='SE_spell_details'),
+    url(r'^api/spell_query/$', instrumented(views.SpellQueryView.as_view()),
+        name='SE_spell_query'),
+    url(r'^api/spell_search/$', instrumented(views.SpellSearchView.as_view()),
+        name='SE_spell_search'),
+    url(r'^api/starred_spells/$',
+        instrumented(views.StarredSpellsView.as_view()),
+        name='SE_starred_spells'),
+    url(r'^api/spells/(?P<name>.*)',
+        instrumented(views.UserSpellView.as_view()), name='UserSpell'),
+    url(r'^spells/(?P<name>.+)$',
+        instrumented(views.SpellListDetail.as_view()),
         name='SE_spell_detail'),
-    url(r'^class/(?P<cls>.*)$', views.SpellClassesView.as_view(),
+    url(r'^class/(?P<cls>.*)$', instrumented(views.SpellClassesView.as_view()),
         name='SE_spell_class'),
+    url(r'^metrics$', views.MetricsView.as_view(), name='SE_metrics'),
     url('', include(social_urls, namespace='social')),
     url('', include(auth_urls, namespace='auth')),
 ]
@@ -2,6 +2,7 @@
 Views for SymmetricalEureka
 """
 
+from collections import OrderedDict
 from importlib import import_module
 try:
     from inspect import signature
@@ -9,13 +10,19 @@ except ImportError:
     # pylint: disable=import-error
     from funcsigs import signature
 
+from django.conf import settings
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.core.urlresolvers import reverse_lazy
+from django.db import transaction
 from django.db.models import base
-from django.http import (Http404, HttpResponseBadRequest, HttpResponseRedirect,
-                         JsonResponse)
+from django.http import (Http404, HttpResponse, HttpResponseBadRequest,
+                         HttpResponseNotModified, HttpResponseRedirect,
+                         JsonResponse, StreamingHttpResponse)
 from django.shortcuts import get_object_or_404
+from django.utils import six
+from django.utils.cache import patch_cache_control
 from django.utils.datastructures import MultiValueDictKeyError
+from django.utils.http import quote_etag
 from django.views.generic import DetailView, ListView
 from django.views.generic.base import TemplateView, View
 from django.views.generic.detail import BaseDetailView
@@ -30,12 +37,25 @@ except ImportError:
 # pylint: disable=wrong-import-order
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import authentication, generics, permissions
+from rest_framework import (authentication, exceptions, generics, permissions,
+                            status)
 
 from .models import (AbilityScores, CASTER_CLASSES, Character, SpellListing,
-                     SpellClasses, UserProfile)
+                     UserProfile)
+from .bulk import bulk_update
+from .cache import spell_cache
+from .catalog import get_catalog_snapshot, get_spell_index, get_spell_rows
+from .catalog_io import CONTENT_TYPES, export_catalog
+from .filters import (SpellFilterBackend, parse_bool, parse_fields,
+                      parse_spell_query)
 from .forms import AbilityScoresForm, CharacterForm
-from .serializers import SpellListingSerializer, SpellClassesSerializer
+from .instrumentation import registry
+from .pagination import SpellCursorPagination
+from .renderers import LIST_RENDERERS
+from .search import get_search_index
+from .serializers import (CharacterSerializer, SpellListingSerializer,
+                          sparse_payload)
+from .stars import is_starred, star_spells, unstar_spells
 
 
 # pylint: disable=too-many-ancestors
@@ -50,8 +70,8 @@ class PlayerLoggedIn(LoginRequiredMixin):
         """
         Override View.get_context_data to add character_list for header.
         """
-        self.character_list = Character.objects.filter(
-            player__user=self.request.user).order_by('character_name')
+        self.character_list = Character.objects.links_for_user(
+            self.request.user.pk)
         return super(PlayerLoggedIn, self).get_context_data(**kwargs)
 
 
@@ -121,20 +141,29 @@ class DisplayCharacterView(PlayerLoggedIn, DetailView):
         Override TemplateView.dispatch to test if Character belongs to User.
         """
         # pylint: disable=attribute-defined-outside-init
-        self.player_character = Character.objects.get(
+        self.player_character = get_object_or_404(
+            Character.objects.select_related('player'),
             Char_uuid=kwargs['Char_uuid'])
-        if self.player_character.player.user.id != request.user.id:
+        if self.player_character.player.user_id != request.user.id:
             raise PermissionDenied()
         return super(DisplayCharacterView, self).dispatch(request, *args,
                                                           **kwargs)
 
+    def get_object(self, queryset=None):
+        """ Return the character already loaded by dispatch."""
+        return self.player_character
+
     def get_context_data(self, **kwargs):
         kwargs['ability_scores'] = self.get_ability_scores()
         return super(DisplayCharacterView, self).get_context_data(**kwargs)
 
     def get_ability_scores(self):
-        """ generate a list of the ability scores for the character."""
-        return AbilityScores.objects.filter(character=self.player_character)
+        """
+        generate a list of the ability scores for the character.  Going
+        through the related manager sets each score's character to
+        self.player_character, so saving_throw doesn't query for it.
+        """
+        return self.player_character.abilityscores_set.order_by('which')
 
 
 def build_kwargs(func, data):
@@ -142,47 +171,101 @@ def build_kwargs(func, data):
     return {x: data.get(x, None) for x in signature(func).parameters.keys()}
 
 
+class BatchError(ValueError):
+    """ Raised for batch arguments that can't be lined up into calls."""
+
+
 class ClassMethodView(View):
     """ Class that exposes classmethods of Django models."""
     module = 'SymmetricalEureka.models'
     extra_methods = {'ability_score_mod': ['abs_saving_throw']}
+    # (module, model, method) -> (classmethod, parameter names), filled in as
+    # each is first requested.
+    _resolved = {}
+
+    @classmethod
+    def resolve(cls, klass, method):
+        """
+        Return the classmethod of model klass called method, and the names
+        of its parameters, or None if there is no such classmethod.
+        """
+        key = (cls.module, klass, method)
+        try:
+            return cls._resolved[key]
+        except KeyError:
+            pass
+        model = getattr(import_module(cls.module), klass, None)
+        if not isinstance(model, type) or not issubclass(model, base.Model):
+            return None
+        try:
+            fnc = getattr(model, method)
+            parameters = tuple(signature(fnc).parameters)
+        except (AttributeError, TypeError, ValueError):
+            return None
+        cls._resolved[key] = (fnc, parameters)
+        return fnc, parameters
+
+    # pylint: disable=no-self-use
+    def call(self, resolved, data):
+        """ Call a resolved classmethod with its arguments from data."""
+        fnc, parameters = resolved
+        return fnc(**{x: data.get(x, None) for x in parameters})
 
     def get(self, request, *args, **kwargs):
         """ Handle get requests by passing arguments to classmethod."""
-        klass = kwargs['model']
-        try:
-            cls = getattr(import_module(self.module), klass)
-        except AttributeError:
-            raise Http404()
-        if not issubclass(cls, base.Model):
-            raise Http404()
         method = kwargs['method']
-        try:
-            fnc = getattr(cls, method)
-        except AttributeError:
+        resolved = self.resolve(kwargs['model'], method)
+        if resolved is None:
             raise Http404()
-        new_kwargs = build_kwargs(fnc, request.GET)
         try:
-            result = fnc(**new_kwargs)
+            result = self.call(resolved, request.GET)
+        except BatchError as err:
+            return HttpResponseBadRequest(six.text_type(err))
         except (TypeError, ValueError):
             return HttpResponseBadRequest()
         response = {method: result}
 
         for other_method in self.extra_methods.get(method, []):
+            resolved = self.resolve(kwargs['model'], other_method) or \
+                (lambda: None, ())
             try:
-                fnc = getattr(cls, other_method)
-            except AttributeError:
-                fnc = lambda: None
-            new_kwargs = build_kwargs(fnc, request.GET)
-            try:
-                result = fnc(**new_kwargs)
-                response[other_method] = result
+                response[other_method] = self.call(resolved, request.GET)
+            except BatchError as err:
+                return HttpResponseBadRequest(six.text_type(err))
             except (TypeError, ValueError):
                 pass
 
         return JsonResponse(response)
 
 
+class ClassMethodBatchView(ClassMethodView):
+    """
+    Class that exposes classmethods of Django models over many sets of
+    arguments at once.  Each parameter is repeated once per call, or given
+    once to be used by every call, and each method responds with a list of
+    results.  Arguments that don't line up, for the method or any of its
+    extra methods, get a 400 saying why.
+    """
+    max_calls = 500
+
+    def call(self, resolved, data):
+        fnc, parameters = resolved
+        if not parameters:
+            return [fnc()]
+        columns = OrderedDict((x, data.getlist(x)) for x in parameters)
+        calls = max(len(values) for values in columns.values()) or 1
+        if calls > self.max_calls:
+            raise BatchError('Too many calls.')
+        for x, values in columns.items():
+            if len(values) <= 1:
+                columns[x] = [values[0] if values else None] * calls
+            elif len(values) != calls:
+                raise BatchError('{} has {} values, expected {}.'.format(
+                    x, len(values), calls))
+        return [fnc(**dict(zip(columns, args)))
+                for args in zip(*columns.values())]
+
+
 class CharacterAtributeView(LoginRequiredMixin, BaseDetailView):
     """ View that exposes Character Attributes as JSON api."""
     model = Character
@@ -241,6 +324,152 @@ class CharacterAtributeView(LoginRequiredMixin, BaseDetailView):
                                        saving_throw=self.object.saving_throw)
 
 
+class CharacterAbilityScoresView(APIView):
+    """
+    Class for the REST API to read or write all of a Character's ability
+    scores at once.  A POST maps ability names to a value, or to an object
+    with a value and/or proficient flag; form data uses `<ability>` and
+    `<ability>_proficient` fields.  The scores are validated together and
+    written in a single statement.
+    """
+    authentication_classes = (authentication.SessionAuthentication,)
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get_character(self, request, char_uuid):
+        """ Return the character, if it belongs to the user."""
+        character = get_object_or_404(
+            Character.objects.select_related('player'), Char_uuid=char_uuid)
+        if character.player.user_id != request.user.id:
+            raise PermissionDenied()
+        return character
+
+    @staticmethod
+    def describe(scores):
+        """ Return the scores, with their modifiers and saving throws."""
+        return OrderedDict(
+            (AbilityScores.WHICH_KEY_2_ENG[score.which], OrderedDict([
+                ('value', score.value),
+                ('proficient', score.proficient),
+                ('ability_score_mod',
+                 AbilityScores.ability_score_mod(score.value)),
+                ('saving_throw', score.saving_throw)]))
+            for score in scores)
+
+    @staticmethod
+    def read_updates(data):
+        """
+        Return a dict mapping ability names to the fields to update.  Form
+        data may carry other fields, such as the CSRF token, so only the
+        ability score fields are read from it.
+        """
+        if hasattr(data, 'getlist'):
+            updates = {}
+            for name in AbilityScores.WHICH_ENG_2_KEY:
+                for field, key in (('value', name),
+                                   ('proficient', name + '_proficient')):
+                    if key in data:
+                        updates.setdefault(name, {})[field] = data[key]
+            return updates
+        if not isinstance(data, dict):
+            raise exceptions.ValidationError(
+                'Expected an object of ability scores.')
+        return {name: update if isinstance(update, dict) else
+                {'value': update} for name, update in data.items()}
+
+    @staticmethod
+    def clean_updates(updates):
+        """
+        Validate every update, raising a single ValidationError listing the
+        problems with all of them.  Returns a dict keyed by `which`.
+        """
+        # pylint: disable=protected-access
+        value_field = AbilityScores._meta.get_field('value')
+        cleaned = {}
+        errors = {}
+        for name, update in updates.items():
+            which = AbilityScores.WHICH_ENG_2_KEY.get(name)
+            if which is None:
+                errors[name] = ['Not an ability score.']
+                continue
+            unknown = set(update) - {'value', 'proficient'}
+            if unknown:
+                errors[name] = ['Unknown fields: {}.'.format(
+                    ', '.join(sorted(unknown)))]
+                continue
+            cleaned[which] = {}
+            if 'value' in update:
+                try:
+                    cleaned[which]['value'] = value_field.clean(
+                        update['value'], None)
+                except ValidationError as err:
+                    errors[name] = err.messages
+            if 'proficient' in update:
+                proficient = update['proficient']
+                if isinstance(proficient, six.string_types):
+                    try:
+                        proficient = parse_bool(name, proficient)
+                    except exceptions.ValidationError:
+                        proficient = None
+                if not isinstance(proficient, bool):
+                    errors.setdefault(name, []).append(
+                        'proficient must be a boolean.')
+                cleaned[which]['proficient'] = proficient
+        if errors:
+            raise exceptions.ValidationError(errors)
+        return cleaned
+
+    # pylint: disable=invalid-name
+    def get(self, request, Char_uuid):
+        character = self.get_character(request, Char_uuid)
+        return Response(self.describe(
+            character.abilityscores_set.order_by('which')))
+
+    def post(self, request, Char_uuid):
+        character = self.get_character(request, Char_uuid)
+        updates = self.clean_updates(self.read_updates(request.data))
+        with transaction.atomic():
+            scores = list(character.abilityscores_set.select_for_update(
+                ).order_by('which'))
+            missing = set(updates) - {score.which for score in scores}
+            if missing:
+                raise exceptions.ValidationError({
+                    AbilityScores.WHICH_KEY_2_ENG[which]:
+                    ['The character has no such score.']
+                    for which in missing})
+            changed = []
+            for score in scores:
+                if score.which in updates:
+                    for field, value in updates[score.which].items():
+                        setattr(score, field, value)
+                    changed.append(score)
+            bulk_update(changed, ('value', 'proficient'))
+        return Response(self.describe(scores))
+
+
+class CharacterCreateView(APIView):
+    """
+    Class for the REST API to create characters for the user.  The body is
+    a character, or a list of up to max_characters of them, each with all
+    six ability scores.  Either every character is created or, if any is
+    invalid, none are.
+    """
+    authentication_classes = (authentication.SessionAuthentication,)
+    permission_classes = (permissions.IsAuthenticated,)
+    max_characters = 500
+
+    def post(self, request):
+        many = isinstance(request.data, list)
+        if many and len(request.data) > self.max_characters:
+            raise exceptions.ValidationError(
+                'At most {} characters may be created at once.'.format(
+                    self.max_characters))
+        serializer = CharacterSerializer(data=request.data, many=many)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(player=get_object_or_404(UserProfile,
+                                                 user=request.user))
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
 class NewCharacterView(PlayerLoggedIn, TemplateView):
     """
     Class for the view to create a new character.
@@ -273,14 +502,15 @@ class NewCharacterView(PlayerLoggedIn, TemplateView):
                 all([af.is_valid() for af in as_forms]):
             character = character_form.save(commit=False)
             character.player = UserProfile.objects.get(user=self.request.user)
-            character.save()
 
+            ability_scores = []
             for as_form in as_forms:
                 ability_score = as_form.save(commit=False)
-                ability_score.character = character
                 ability_score.which = AbilityScores.WHICH_ENG_2_KEY[
                     as_form.prefix]
-                ability_score.save()
+                ability_scores.append(ability_score)
+            Character.objects.create_with_scores(
+                [(character, ability_scores)])
 
             return HttpResponseRedirect(character.get_absolute_url())
         else:
@@ -290,7 +520,9 @@ class NewCharacterView(PlayerLoggedIn, TemplateView):
 
 class SpellListView(ListView):
     """
-    Class for the view to display Spells.
+    Class for the view to display Spells.  The rows of the table are
+    rendered once per catalog version, and only the stars are rendered for
+    each request.
     """
 
     model = SpellListing
@@ -301,53 +533,313 @@ class SpellListView(ListView):
 
     def get_context_data(self, **kwargs):
         kwargs['caster_classes'] = CASTER_CLASSES
-        profile = UserProfile.objects.get(user=self.request.user)
-        kwargs['profile'] = profile
-        kwargs['starred'] = profile.spells.all()
+        kwargs['starred'] = self.get_starred()
+        kwargs['spell_rows'] = get_spell_rows()
         kwargs = super(SpellListView, self).get_context_data(**kwargs)
         return kwargs
 
+    def get_starred(self):
+        """
+        Return the set of primary keys of the spells starred by the user, so
+        the template can test each row in constant time.
+        """
+        if not self.request.user.is_authenticated():
+            return set()
+        return set(SpellListing.objects.filter(
+            userprofile__user=self.request.user).values_list('pk', flat=True))
+
+
+def spell_fields(request):
+    """
+    Return the spell fields selected by the fields and exclude query
+    parameters of request, or None for all of them.
+    """
+    return parse_fields(request.query_params,
+                        SpellListingSerializer.value_fields())
+
 
 class SpellListDetail(generics.RetrieveAPIView):
     """
-    Class for the REST API to display Spell details.
+    Class for the REST API to display Spell details, looked up by name.
+    Payloads are served from spell_cache.  The fields and exclude query
+    parameters select the fields returned.
     """
     queryset = SpellListing.objects.all()
     serializer_class = SpellListingSerializer
+    lookup_field = 'name'
+
+    def retrieve(self, request, *args, **kwargs):
+        payload = spell_cache.get(kwargs[self.lookup_url_kwarg or
+                                         self.lookup_field])
+        if payload is None:
+            raise Http404
+        return Response(sparse_payload(payload, spell_fields(request)))
+
 
+def etag_matches(request, etag):
+    """ Test if etag satisfies the If-None-Match header of request."""
+    header = request.META.get('HTTP_IF_NONE_MATCH', '').strip()
+    if header == '*':
+        return True
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
 
-class SpellClassesView(generics.ListAPIView):
+
+class SpellCatalogView(View):
     """
-    Class for the REST API to display spells by class.
+    Class for the view that serves the whole spell catalog as one JSON
+    document.  The document is tagged with the catalog version, so clients
+    can revalidate with If-None-Match, and a request for ?v=<version> names
+    content that never changes and may be cached indefinitely.
     """
-    serializer_class = SpellClassesSerializer
+    max_age = 300
+    versioned_max_age = 365 * 24 * 60 * 60
+
+    def get(self, request, *args, **kwargs):
+        """ Respond with the catalog, or 304 if the client has it."""
+        version, snapshot = get_catalog_snapshot()
+        etag = quote_etag(version)
+        if etag_matches(request, etag):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(snapshot, content_type='application/json')
+        response['ETag'] = etag
+        if request.GET.get('v') == version:
+            patch_cache_control(response, public=True, immutable=True,
+                                max_age=self.versioned_max_age)
+        else:
+            patch_cache_control(response, public=True, max_age=self.max_age)
+        return response
 
-    def get_queryset(self):
-        cls = self.kwargs['cls']
-        return SpellClasses.objects.filter(caster_class__exact=cls)
+
+def request_names(request):
+    """
+    Return the `names` list from the body of request, which must be form
+    data or a JSON object.
+    """
+    if hasattr(request.data, 'getlist'):
+        return request.data.getlist('names')
+    if not isinstance(request.data, dict):
+        raise exceptions.ValidationError(
+            {'names': 'Expected a list of names.'})
+    return request.data.get('names', [])
+
+
+def clean_names(names, max_names):
+    """
+    Check that names is a list of at most max_names spell names, and return
+    it without duplicates.
+    """
+    if not isinstance(names, list) or \
+            not all(isinstance(name, six.string_types) for name in names):
+        raise exceptions.ValidationError(
+            {'names': 'Expected a list of names.'})
+    names = list(OrderedDict.fromkeys(names))
+    if len(names) > max_names:
+        raise exceptions.ValidationError(
+            {'names': 'At most {} names may be given.'.format(max_names)})
+    return names
+
+
+class SpellDetailBatchView(APIView):
+    """
+    Class for the REST API to display the details of many Spells at once.
+    Names are passed as repeated `name` query parameters, or as a `names`
+    list in the body of a POST.  Spells missing from spell_cache are all
+    fetched in a single query.  The fields and exclude query parameters
+    select the fields returned.
+    """
+    max_names = 500
+    renderer_classes = LIST_RENDERERS
+
+    def get(self, request):
+        return self.get_spells(request, request.query_params.getlist('name'))
+
+    def post(self, request):
+        return self.get_spells(request, request_names(request))
+
+    def get_spells(self, request, names):
+        """ Respond with the serialized spells, in the order requested."""
+        fields = spell_fields(request)
+        names = clean_names(names, self.max_names)
+        spells = spell_cache.get_many(names)
+        return Response([sparse_payload(spells[name], fields)
+                         for name in names if name in spells])
+
+
+class SpellExportView(APIView):
+    """
+    Class for the REST API to download the spell catalog as JSON lines or
+    CSV.  The filters of SpellListAPIView, including starred, select the
+    spells, and with_classes=false leaves out their classes.  The file is
+    streamed as it is read from the database.
+    """
+    filter_backend = SpellFilterBackend
+
+    def get(self, request, fmt):
+        queryset = self.filter_backend().filter_queryset(
+            request, SpellListing.objects.all(), self)
+        with_classes = parse_bool(
+            'with_classes', request.query_params.get('with_classes', 'true'))
+        response = StreamingHttpResponse(
+            export_catalog(queryset, fmt, with_classes),
+            content_type=CONTENT_TYPES[fmt])
+        response['Content-Disposition'] = \
+            'attachment; filename="spells.{}"'.format(fmt)
+        return response
+
+
+class SpellListAPIView(generics.ListAPIView):
+    """
+    Class for the REST API to list Spells.  Results are filtered in SQL by
+    the query parameters understood by SpellFilterBackend and returned one
+    page at a time.  Pages are serialized from values() rows, and the
+    fields and exclude query parameters limit both the fields returned and
+    the columns loaded.
+    """
+    queryset = SpellListing.objects.all()
+    serializer_class = SpellListingSerializer
+    filter_backends = (SpellFilterBackend,)
+    pagination_class = SpellCursorPagination
+    renderer_classes = LIST_RENDERERS
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        fields = spell_fields(request)
+        if fields is None:
+            fields = serializer_class.value_fields()
+        # The cursor is read from the ordering column, so it is always loaded.
+        columns = set(fields) | {self.pagination_class.ordering}
+        queryset = self.filter_queryset(self.get_queryset()).values(*columns)
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(
+            serializer_class.from_values(page, fields))
+
+
+class SpellSearchView(APIView):
+    """
+    Class for the REST API to search Spells by name, description and material
+    components.  Results are ranked best match first.
+    """
+    default_limit = 20
+    max_limit = 100
+    renderer_classes = LIST_RENDERERS
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+        names = get_search_index().search(query, limit)
+        return Response([{'spell': name} for name in names])
+
+
+class SpellClassesView(APIView):
+    """
+    Class for the REST API to display spells by class.  The query parameters
+    of SpellQueryView narrow the result further.
+    """
+    renderer_classes = LIST_RENDERERS
+
+    # pylint: disable=no-self-use
+    def get(self, request, cls):
+        query = parse_spell_query(request.query_params)
+        query['class'] = {cls}
+        index = get_spell_index()
+        return Response([{'spell': name}
+                         for name in index.spell_names(index.select(query))])
+
+
+class SpellQueryView(APIView):
+    """
+    Class for the REST API to find spells matching a combination of filters.
+    class, level, school and component may be repeated or comma separated
+    and match any of their values; ritual and concentration are booleans;
+    all the filters given must match.  Answers come from the in-process
+    SpellIndex, so the only database query is for the catalog version.
+    """
+    renderer_classes = LIST_RENDERERS
+
+    # pylint: disable=no-self-use
+    def get(self, request):
+        query = parse_spell_query(request.query_params)
+        index = get_spell_index()
+        return Response([{'spell': name}
+                         for name in index.spell_names(index.select(query))])
 
 
 class UserSpellView(APIView):
     """
-    Class for the REST API to handle adding/removing Spells to User.
+    Class for the REST API to handle adding/removing Spells to User.  PUT
+    stars the spell and DELETE unstars it, each idempotent and written with
+    one statement; POST toggles it.
     """
     authentication_classes = (authentication.SessionAuthentication,)
     permission_classes = (permissions.IsAuthenticated,)
 
-    def post(self, request, pk):
-        user = request.user
-        profile = get_object_or_404(UserProfile, user=user)
-        queryset = profile.spells.filter(name=pk)
-        starred = False
-        if queryset.count() == 0:
-            spell = get_object_or_404(SpellListing, name=pk)
-            profile.spells.add(spell)
-            starred = True
-        else:
-            profile.spells.remove(queryset[0])
+    @staticmethod
+    def starred(name, starred):
+        """ Respond with whether the spell is starred."""
+        return Response({"Spell": name, "starred": starred})
+
+    def put(self, request, name):
+        if not star_spells(request.user, [name]) and \
+                not is_starred(request.user, name):
+            raise Http404()
+        return self.starred(name, True)
+
+    def delete(self, request, name):
+        unstar_spells(request.user, [name])
+        return self.starred(name, False)
+
+    def post(self, request, name):
+        if unstar_spells(request.user, [name]):
+            return self.starred(name, False)
+        return self.put(request, name)
+
 
-        data = {
-            "Spell": pk,
-            "starred": starred
-        }
-        return Response(data)
+class StarredSpellsView(APIView):
+    """
+    Class for the REST API to star or unstar many Spells at once.  GET lists
+    the names of the user's starred spells.  PUT stars, and DELETE unstars,
+    the spells named in a `names` list in the body, and both respond with
+    how many spells changed.
+    """
+    authentication_classes = (authentication.SessionAuthentication,)
+    permission_classes = (permissions.IsAuthenticated,)
+    max_names = 500
+    renderer_classes = LIST_RENDERERS
+
+    def get(self, request):
+        return Response(list(SpellListing.objects.filter(
+            userprofile__user=request.user).order_by('name').values_list(
+                'name', flat=True)))
+
+    def put(self, request):
+        names = clean_names(request_names(request), self.max_names)
+        return Response({'starred': star_spells(request.user, names)})
+
+    def delete(self, request):
+        names = clean_names(request_names(request), self.max_names)
+        return Response({'unstarred': unstar_spells(request.user, names)})
+
+
+class MetricsView(View):
+    """
+    Class for the view that serves the totals of the instrumented views in
+    the Prometheus text format.  Only staff, and INTERNAL_IPS, may read them.
+    """
+    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def get(self, request):
+        if not request.user.is_staff and \
+                request.META.get('REMOTE_ADDR') not in settings.INTERNAL_IPS:
+            raise PermissionDenied()
+        return HttpResponse(registry.render(), content_type=self.content_type)
@@ -5,19 +5,28 @@ Classes to test views code.
 
 from __future__ import unicode_literals
 
+import re
 from contextlib import contextmanager
-from json import loads
+from decimal import Decimal
+from json import dumps, loads
 
 from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse  # , resolve
+from django.db import connection
 from django.http import (HttpResponseBadRequest, HttpResponseForbidden,
                          HttpResponseNotFound, JsonResponse)
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 
+from rest_framework.renderers import JSONRenderer
 from six import exec_
 
-from SymmetricalEureka.models import AbilityScores, Character, UserProfile
-from SymmetricalEureka.views import ClassMethodView
+from SymmetricalEureka.models import (AbilityScores, Character, SpellListing,
+                                      UserProfile)
+from SymmetricalEureka.renderers import PlainJSONRenderer
+from SymmetricalEureka.serializers import SpellListingSerializer
+from SymmetricalEureka.views import (CharacterCreateView, ClassMethodBatchView,
+                                     ClassMethodView)
 
 
 class OneUserGeneric(TestCase):
@@ -227,6 +236,79 @@ class TestJsonClassViews(TestCase):
                              loads(response.content.decode('utf-8')))
 
 
+class TestJsonClassBatchViews(TestCase):
+    """ Test classmethods called over arrays of arguments."""
+
+    def setUp(self):
+        self.url = reverse('SE_ClassMethodBatch',
+                           kwargs={'model': 'AbilityScores',
+                                   'method': 'ability_score_mod'})
+
+    def get_json(self, query):
+        """ GET the batch endpoint with query."""
+        response = self.client.get('{}?{}'.format(self.url, query))
+        self.assertIsInstance(response, JsonResponse)
+        return loads(response.content.decode('utf-8'))
+
+    def test_ability_score_mods(self):
+        """ Test that every score gets its modifier and saving throw."""
+        scores = [3, 10, 18, 25]
+        proficient = ['true', 'false', 'false', 'true']
+        resp = self.get_json('&'.join(
+            'ability_score={}&proficient={}'.format(score, prof)
+            for score, prof in zip(scores, proficient)))
+        self.assertEqual(resp, {
+            'ability_score_mod': [AbilityScores.ability_score_mod(score)
+                                  for score in scores],
+            'abs_saving_throw': [
+                AbilityScores.abs_saving_throw(score, prof)
+                for score, prof in zip(scores, proficient)]})
+
+    def test_single_value_broadcast(self):
+        """ Test that an argument given once is used for every call."""
+        resp = self.get_json('ability_score=10&ability_score=14'
+                             '&proficient=true')
+        self.assertEqual(resp, {'ability_score_mod': [0, 2],
+                                'abs_saving_throw': [2, 4]})
+
+    def test_mismatched_lengths(self):
+        """ Test that arrays of different lengths are rejected."""
+        response = self.client.get(
+            '{}?ability_score=10&ability_score=14&ability_score=16'
+            '&proficient=true&proficient=false'.format(self.url))
+        self.assertIsInstance(response, HttpResponseBadRequest)
+        self.assertEqual(response.content.decode('utf-8'),
+                         'proficient has 2 values, expected 3.')
+
+    def test_bad_value(self):
+        """ Test that a bad score fails the batch."""
+        response = self.client.get(
+            '{}?ability_score=10&ability_score=ten'.format(self.url))
+        self.assertIsInstance(response, HttpResponseBadRequest)
+
+    def test_too_many_calls(self):
+        """ Test that the number of calls is limited."""
+        response = self.client.get('{}?{}'.format(self.url, '&'.join(
+            ['ability_score=10'] * (ClassMethodBatchView.max_calls + 1))))
+        self.assertIsInstance(response, HttpResponseBadRequest)
+
+    def test_bad_method(self):
+        """ Test that a method that doesn't exist returns 404."""
+        url = reverse('SE_ClassMethodBatch',
+                      kwargs={'model': 'Character', 'method': 'i_dont_exist'})
+        response = self.client.get(url)
+        self.assertIsInstance(response, HttpResponseNotFound)
+
+    def test_resolution_is_cached(self):
+        """ Test that classmethods are resolved once."""
+        self.get_json('ability_score=10')
+        fnc, parameters = ClassMethodView.resolve('AbilityScores',
+                                                  'abs_saving_throw')
+        self.assertEqual(parameters, ('ability_score', 'proficient'))
+        self.assertIs(ClassMethodView.resolve('AbilityScores',
+                                              'abs_saving_throw')[0], fnc)
+
+
 class JsonCharacterViewsTest(UserWithCharacterGeneric):
     """ Test View that exposes Chracter attributes."""
 
@@ -356,3 +438,630 @@ class JsonCharacterView2UsersTest(TwoUsersWithCharacterGeneric):
         """
         response = self.client.get(self.url)
         self.assertIsInstance(response, HttpResponseForbidden)
+
+
+class CharacterAbilityScoresTest(UserWithCharacterGeneric):
+    """ Test the API that reads and writes all ability scores at once."""
+
+    def setUp(self):
+        super(CharacterAbilityScoresTest, self).setUp()
+        self.url = reverse('SE_character_scores',
+                           kwargs={'Char_uuid':
+                                   self.test_character.Char_uuid})
+
+    def post_json(self, data):
+        """ POST data as JSON."""
+        return self.client.post(self.url, dumps(data),
+                                content_type='application/json')
+
+    def get_scores(self):
+        """ Return the character's scores from the database."""
+        return {AbilityScores.WHICH_KEY_2_ENG[score.which]:
+                (score.value, score.proficient)
+                for score in AbilityScores.objects.filter(
+                    character=self.test_character)}
+
+    def test_get_scores(self):
+        """ Test that every score is returned with its modifiers."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        resp = loads(response.content.decode('utf-8'))
+        self.assertEqual(len(resp), 6)
+        for name, (value, proficient) in self.get_scores().items():
+            self.assertEqual(resp[name], {
+                'value': value, 'proficient': proficient,
+                'ability_score_mod': AbilityScores.ability_score_mod(value),
+                'saving_throw': AbilityScores.abs_saving_throw(value,
+                                                               proficient)})
+
+    def test_post_all_scores(self):
+        """ Test that all six scores are written in one request."""
+        data = {name: {'value': 10 + i, 'proficient': i % 2 == 0}
+                for i, (_, name) in enumerate(AbilityScores.WHICH_CHOICES)}
+        response = self.post_json(data)
+        self.assertEqual(response.status_code, 200)
+        resp = loads(response.content.decode('utf-8'))
+        self.assertEqual(self.get_scores(), {
+            name: (update['value'], update['proficient'])
+            for name, update in data.items()})
+        self.assertEqual(resp['dexterity'], {
+            'value': 11, 'proficient': False, 'ability_score_mod': 0,
+            'saving_throw': 0})
+        self.assertEqual(resp['constitution'], {
+            'value': 12, 'proficient': True, 'ability_score_mod': 1,
+            'saving_throw': 3})
+
+    def test_post_query_count(self):
+        """ Test that the scores are written with a single UPDATE."""
+        data = {name: 12 for _, name in AbilityScores.WHICH_CHOICES}
+        # session, user, character, scores, update, plus the savepoint
+        with self.assertNumQueries(7):
+            response = self.post_json(data)
+        self.assertEqual(response.status_code, 200)
+
+    def test_post_some_scores(self):
+        """ Test that scores left out are unchanged."""
+        before = self.get_scores()
+        response = self.post_json({'strength': 14,
+                                   'wisdom': {'proficient': True}})
+        self.assertEqual(response.status_code, 200)
+        after = self.get_scores()
+        self.assertEqual(after['strength'], (14, before['strength'][1]))
+        self.assertEqual(after['wisdom'], (before['wisdom'][0], True))
+        self.assertEqual(after['charisma'], before['charisma'])
+
+    def test_post_form_data(self):
+        """ Test that scores may be posted as a form."""
+        response = self.client.post(self.url, {
+            'strength': 8, 'strength_proficient': 'true'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_scores()['strength'], (8, True))
+
+    def test_post_form_with_csrf(self):
+        """ Test posting a form with the token of a rendered page."""
+        csrf_client = Client(enforce_csrf_checks=True)
+        try:
+            csrf_client.force_login(self.test_user.user)
+        except AttributeError:
+            # For Django 1.8
+            csrf_client.login(username="Mike", password="password")
+        page = csrf_client.get(reverse('new_character')).content.decode(
+            'utf-8')
+        csrf_token = re.search(
+            r'name=["\']csrfmiddlewaretoken["\'] value=["\']([^"\']+)',
+            page).group(1)
+        before = self.get_scores()
+        response = csrf_client.post(self.url, {
+            'csrfmiddlewaretoken': csrf_token, 'dexterity': 16,
+            'dexterity_proficient': 'true', 'submit': 'Save'})
+        self.assertEqual(response.status_code, 200)
+        after = self.get_scores()
+        self.assertEqual(after.pop('dexterity'), (16, True))
+        before.pop('dexterity')
+        self.assertEqual(after, before)
+
+        response = csrf_client.post(self.url, {'dexterity': 12})
+        self.assertEqual(response.status_code, 403)
+
+    def test_bad_scores_rejected_together(self):
+        """ Test that every error is reported and nothing is written."""
+        before = self.get_scores()
+        response = self.post_json({'strength': 15, 'dexterity': 35,
+                                   'wisdom': {'proficient': 'maybe'},
+                                   'luck': 3})
+        self.assertEqual(response.status_code, 400)
+        resp = loads(response.content.decode('utf-8'))
+        self.assertEqual(sorted(resp), ['dexterity', 'luck', 'wisdom'])
+        self.assertEqual(self.get_scores(), before)
+
+    def test_requires_login(self):
+        """ Test that anonymous users are rejected."""
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.assertEqual(self.post_json({'strength': 10}).status_code, 403)
+
+
+class CharacterAbilityScores2UsersTest(TwoUsersWithCharacterGeneric):
+    """ Test that ability scores can't be written by another user."""
+
+    def test_other_user_forbidden(self):
+        """ Test that another user's character is forbidden."""
+        url = reverse('SE_character_scores',
+                      kwargs={'Char_uuid': self.test_character.Char_uuid})
+        response = self.client.post(url, dumps({'strength': 3}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        self.assertNotEqual(AbilityScores.objects.get(
+            character=self.test_character, which='0_STR').value, 3)
+
+
+class CharacterCreateTest(OneUserGeneric):
+    """ Test the API that creates characters."""
+
+    def setUp(self):
+        super(CharacterCreateTest, self).setUp()
+        self.url = reverse('SE_characters')
+
+    @staticmethod
+    def make_character(name, value=10):
+        """ Return the data of a character."""
+        return {'character_name': name, 'alignment': 'NG',
+                'ability_scores': {score: value for _, score
+                                   in AbilityScores.WHICH_CHOICES}}
+
+    def post_json(self, data):
+        """ POST data as JSON."""
+        return self.client.post(self.url, dumps(data),
+                                content_type='application/json')
+
+    def test_create_one(self):
+        """ Test creating a single character."""
+        response = self.post_json(self.make_character('Hrothgar', 14))
+        self.assertEqual(response.status_code, 201)
+        resp = loads(response.content.decode('utf-8'))
+        character = Character.objects.get(character_name='Hrothgar')
+        self.assertEqual(character.player, self.test_user)
+        self.assertEqual(resp['Char_uuid'], str(character.Char_uuid))
+        self.assertEqual(resp['url'], character.get_absolute_url())
+        self.assertEqual(sorted(AbilityScores.objects.filter(
+            character=character).values_list('which', 'value')),
+                         [(which, 14) for which, _ in
+                          AbilityScores.WHICH_CHOICES])
+
+    def test_create_many(self):
+        """ Test that many characters are created with two INSERTs."""
+        data = [self.make_character('Player {}'.format(i), 8 + i)
+                for i in range(12)]
+        # session, user, profile, two INSERTs, plus the savepoint
+        with self.assertNumQueries(7):
+            response = self.post_json(data)
+        self.assertEqual(response.status_code, 201)
+        resp = loads(response.content.decode('utf-8'))
+        self.assertEqual([character['character_name'] for character in resp],
+                         [character['character_name'] for character in data])
+        self.assertEqual(Character.objects.filter(
+            player=self.test_user).count(), 12)
+        self.assertEqual(AbilityScores.objects.filter(
+            character__player=self.test_user).count(), 72)
+        self.assertEqual(AbilityScores.objects.get(
+            character__character_name='Player 3', which='4_WIS').value, 11)
+
+    def test_invalid_character_creates_none(self):
+        """ Test that one bad character fails the whole request."""
+        bad = self.make_character('Bad')
+        bad['alignment'] = 'ZZ'
+        del bad['ability_scores']['charisma']
+        response = self.post_json([self.make_character('Good'), bad])
+        self.assertEqual(response.status_code, 400)
+        resp = loads(response.content.decode('utf-8'))
+        self.assertEqual(resp[0], {})
+        self.assertIn('alignment', resp[1])
+        self.assertIn('charisma', resp[1]['ability_scores'])
+        self.assertFalse(Character.objects.exists())
+
+    def test_score_out_of_range(self):
+        """ Test that scores are validated."""
+        character = self.make_character('Hrothgar')
+        character['ability_scores']['strength'] = 26
+        response = self.post_json(character)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Character.objects.exists())
+
+    def test_too_many_characters(self):
+        """ Test that the number of characters is limited."""
+        response = self.post_json(
+            [self.make_character(str(i))
+             for i in range(CharacterCreateView.max_characters + 1)])
+        self.assertEqual(response.status_code, 400)
+
+    def test_requires_login(self):
+        """ Test that anonymous users are rejected."""
+        self.client.logout()
+        response = self.post_json(self.make_character('Hrothgar'))
+        self.assertEqual(response.status_code, 403)
+
+
+class UserSpellTest(OneUserGeneric):
+    """ Test starring and unstarring spells."""
+    fixtures = ['user_mike.json', 'spell_data.json']
+
+    def url(self, name):
+        """ Return the url to star the spell called name."""
+        return reverse('UserSpell', kwargs={'name': name})
+
+    def get_starred(self):
+        """ Return the names of the user's starred spells."""
+        return set(self.test_user.spells.values_list('name', flat=True))
+
+    def request(self, method, name):
+        """ Make a request and return its JSON response."""
+        response = getattr(self.client, method)(self.url(name))
+        self.assertEqual(response.status_code, 200)
+        return loads(response.content.decode('utf-8'))
+
+    def test_put_stars(self):
+        """ Test that PUT stars a spell, and repeating it changes nothing."""
+        self.assertEqual(self.request('put', 'Fireball'),
+                         {'Spell': 'Fireball', 'starred': True})
+        self.assertEqual(self.request('put', 'Fireball'),
+                         {'Spell': 'Fireball', 'starred': True})
+        self.assertEqual(self.get_starred(), {'Fireball'})
+
+    def test_delete_unstars(self):
+        """ Test that DELETE unstars a spell, and repeating it is fine."""
+        self.test_user.spells.add(SpellListing.objects.get(name='Fireball'),
+                                  SpellListing.objects.get(name='Aid'))
+        self.assertEqual(self.request('delete', 'Fireball'),
+                         {'Spell': 'Fireball', 'starred': False})
+        self.assertEqual(self.request('delete', 'Fireball'),
+                         {'Spell': 'Fireball', 'starred': False})
+        self.assertEqual(self.get_starred(), {'Aid'})
+
+    def test_post_toggles(self):
+        """ Test that POST toggles a spell."""
+        self.assertTrue(self.request('post', 'Fireball')['starred'])
+        self.assertFalse(self.request('post', 'Fireball')['starred'])
+        self.assertEqual(self.get_starred(), set())
+
+    def test_single_statement(self):
+        """ Test that starring and unstarring write with one statement."""
+        # session, user, and the write wrapped in a savepoint
+        with self.assertNumQueries(5):
+            self.request('put', 'Fireball')
+        # session, user, delete
+        with self.assertNumQueries(3):
+            self.request('delete', 'Fireball')
+
+    def test_unknown_spell(self):
+        """ Test that starring a spell that doesn't exist returns 404."""
+        response = self.client.put(self.url('I dont exist'))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.get_starred(), set())
+
+    def test_requires_login(self):
+        """ Test that anonymous users can't star spells."""
+        self.client.logout()
+        self.assertEqual(self.client.put(self.url('Fireball')).status_code,
+                         403)
+
+
+class StarredSpellsTest(OneUserGeneric):
+    """ Test starring and unstarring many spells at once."""
+    fixtures = ['user_mike.json', 'spell_data.json']
+
+    def setUp(self):
+        super(StarredSpellsTest, self).setUp()
+        self.url = reverse('SE_starred_spells')
+
+    def request(self, method, names):
+        """ Send names as JSON and return the JSON response."""
+        response = getattr(self.client, method)(
+            self.url, dumps({'names': names}),
+            content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return loads(response.content.decode('utf-8'))
+
+    def get_starred(self):
+        """ Return the names of the starred spells from the API."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return loads(response.content.decode('utf-8'))
+
+    def test_star_many(self):
+        """ Test that many spells are starred with one INSERT."""
+        names = list(SpellListing.objects.order_by('name').values_list(
+            'name', flat=True)[:40])
+        self.test_user.spells.add(SpellListing.objects.get(name=names[0]))
+        # session, user, and the INSERT wrapped in a savepoint
+        with self.assertNumQueries(5):
+            resp = self.request('put', names + ['I dont exist'])
+        self.assertEqual(resp, {'starred': 39})
+        self.assertEqual(self.get_starred(), names)
+
+    def test_unstar_many(self):
+        """ Test that many spells are unstarred with one DELETE."""
+        self.test_user.spells.add(*SpellListing.objects.all()[:30])
+        names = self.get_starred()
+        with self.assertNumQueries(3):
+            resp = self.request('delete', names[:20])
+        self.assertEqual(resp, {'unstarred': 20})
+        self.assertEqual(self.get_starred(), names[20:])
+
+    def test_bad_names(self):
+        """ Test that names must be a list of strings."""
+        response = self.client.put(self.url, dumps({'names': 'Aid'}),
+                                   content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_body_not_an_object(self):
+        """ Test that a JSON body that isn't an object is rejected."""
+        for method in ('put', 'delete'):
+            for body in (['Aid'], 'Aid'):
+                response = getattr(self.client, method)(
+                    self.url, dumps(body), content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+
+
+class SpellListAPITest(OneUserGeneric):
+    """ Test the filtered, paginated spell list API."""
+    fixtures = ['user_mike.json', 'spell_data.json']
+
+    def setUp(self):
+        super(SpellListAPITest, self).setUp()
+        self.url = reverse('SE_spell_list_api')
+
+    def get_names(self, **params):
+        """ Return the spell names from every page of the API."""
+        names = []
+        response = self.client.get(self.url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            resp = loads(response.content.decode('utf-8'))
+            names.extend(spell['name'] for spell in resp['results'])
+            if resp['next'] is None:
+                return names
+            response = self.client.get(resp['next'])
+
+    def test_pages_are_ordered_by_name(self):
+        """ Test that walking the pages returns the whole catalog in order."""
+        names = self.get_names(page_size=100)
+        self.assertEqual(names, list(SpellListing.objects.order_by(
+            'name').values_list('name', flat=True)))
+
+    def test_page_size(self):
+        """ Test that only the requested page is returned."""
+        response = self.client.get(self.url, {'page_size': 10})
+        resp = loads(response.content.decode('utf-8'))
+        self.assertEqual(len(resp['results']), 10)
+        self.assertIsNone(resp['previous'])
+
+    def test_filter_class_and_level(self):
+        """ Test that class and level filters are combined."""
+        names = self.get_names(**{'class': 'wi', 'level': '3'})
+        expected = SpellListing.objects.filter(
+            level=3, spellclasses__caster_class='wi').order_by('name')
+        self.assertEqual(names, [spell.name for spell in expected])
+
+    def test_filter_cantrip_school_ritual(self):
+        """ Test the cantrip alias and the school and boolean filters."""
+        names = self.get_names(level='Cantrip', school='ev')
+        expected = SpellListing.objects.filter(level=0, school='ev')
+        self.assertEqual(set(names), {spell.name for spell in expected})
+
+        names = self.get_names(ritual='true', concentration='false')
+        expected = SpellListing.objects.filter(ritual=True,
+                                               concentration=False)
+        self.assertEqual(set(names), {spell.name for spell in expected})
+
+    def test_filter_starred(self):
+        """ Test that the starred filter is restricted to the user."""
+        self.test_user.spells.add(SpellListing.objects.get(name='Aid'))
+        self.assertEqual(self.get_names(starred='yes'), ['Aid'])
+        self.assertNotIn('Aid', self.get_names(starred='no'))
+
+        self.client.logout()
+        self.assertEqual(self.get_names(starred='yes'), [])
+
+    def test_filter_several_values(self):
+        """ Test that repeated and comma separated values are combined."""
+        names = self.get_names(**{'class': ['pd', 'rg'], 'level': '1,2',
+                                  'component': 'V'})
+        expected = SpellListing.objects.filter(
+            spellclasses__caster_class__in=['pd', 'rg'], level__in=[1, 2],
+            components='V').distinct().order_by('name')
+        self.assertEqual(names, [spell.name for spell in expected])
+
+    def test_bad_filters(self):
+        """ Test that invalid filter values are rejected."""
+        for params in ({'class': 'xx'}, {'class': 'é'}, {'level': '10'},
+                       {'school': 'zz'}, {'ritual': 'maybe'},
+                       {'fields': 'naïve'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400)
+
+    def test_matches_serializer(self):
+        """ Test that spells built from values() match the serializer."""
+        response = self.client.get(self.url, {'page_size': 100})
+        resp = loads(response.content.decode('utf-8'))
+        expected = SpellListingSerializer(
+            SpellListing.objects.order_by('name')[:100], many=True).data
+        self.assertEqual(resp['results'], loads(dumps(expected)))
+
+    def test_sparse_fields(self):
+        """ Test that fields and exclude limit the fields and columns."""
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.url, {'fields': 'level,name',
+                                                  'level': 'Cantrip'})
+        resp = loads(response.content.decode('utf-8'))
+        self.assertEqual(set(resp['results'][0]), {'name', 'level'})
+        self.assertEqual(resp['results'][0]['level'], 'Cantrip')
+        self.assertFalse(any('description' in query['sql']
+                             for query in captured.captured_queries))
+
+        response = self.client.get(self.url, {'exclude': 'name,description'})
+        resp = loads(response.content.decode('utf-8'))
+        self.assertNotIn('name', resp['results'][0])
+        self.assertNotIn('description', resp['results'][0])
+        self.assertIn('school', resp['results'][0])
+        # The cursor still works without the name field.
+        self.assertEqual(
+            self.client.get(resp['next']).status_code, 200)
+
+        for params in ({'fields': 'id'}, {'exclude': 'nonsense'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400)
+
+
+class PlainJSONRendererTest(TestCase):
+    """ Test that PlainJSONRenderer renders as JSONRenderer does."""
+
+    def test_plain_data(self):
+        """ Test plain data, including characters escaped for JavaScript."""
+        data = {'name': 'Aid\u2028', 'level': 2, 'ritual': False,
+                'classes': ['cl', 'pd'], 'page': None}
+        self.assertEqual(PlainJSONRenderer().render(data),
+                         JSONRenderer().render(data))
+
+    def test_falls_back(self):
+        """ Test that other types and indented output use JSONRenderer."""
+        data = {'weight': Decimal('1.5')}
+        self.assertEqual(PlainJSONRenderer().render(data),
+                         JSONRenderer().render(data))
+        context = {'indent': 4}
+        self.assertEqual(
+            PlainJSONRenderer().render(data, renderer_context=context),
+            JSONRenderer().render(data, renderer_context=context))
+        self.assertEqual(PlainJSONRenderer().render(None), b'')
+
+
+class SpellDetailBatchTest(TestCase):
+    """ Test the batch spell detail API."""
+    fixtures = ['spell_data.json']
+
+    def setUp(self):
+        self.url = reverse('SE_spell_details')
+        self.names = ['Fireball', 'Aid', 'I do not exist', 'Fireball',
+                      "Otiluke's Freezing Sphere"]
+
+    def check_response(self, response):
+        """ Test that the response contains the known spells in order."""
+        self.assertEqual(response.status_code, 200)
+        resp = loads(response.content.decode('utf-8'))
+        self.assertEqual([spell['name'] for spell in resp],
+                         ['Fireball', 'Aid', "Otiluke's Freezing Sphere"])
+        detail = self.client.get(reverse('SE_spell_detail',
+                                         kwargs={'name': 'Aid'}))
+        self.assertEqual(resp[1], loads(detail.content.decode('utf-8')))
+
+    def test_get(self):
+        """ Test fetching spells by repeated query parameters."""
+        # the catalog version, and the spells missing from the cache
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'name': self.names})
+        self.check_response(response)
+
+    def test_post_json(self):
+        """ Test fetching spells by posting a JSON list."""
+        response = self.client.post(self.url, dumps({'names': self.names}),
+                                    content_type='application/json')
+        self.check_response(response)
+
+    def test_post_form(self):
+        """ Test fetching spells by posting form data."""
+        response = self.client.post(self.url, {'names': self.names})
+        self.check_response(response)
+
+    def test_sparse_fields(self):
+        """ Test that fields and exclude limit the cached payloads."""
+        response = self.client.get(self.url, {'name': self.names,
+                                              'fields': ['name', 'school']})
+        resp = loads(response.content.decode('utf-8'))
+        self.assertEqual(resp[0], {'name': 'Fireball', 'school': 'Evocation'})
+
+        response = self.client.get(
+            reverse('SE_spell_detail', kwargs={'name': 'Aid'}),
+            {'exclude': 'description'})
+        resp = loads(response.content.decode('utf-8'))
+        self.assertEqual(resp['name'], 'Aid')
+        self.assertNotIn('description', resp)
+
+    def test_bad_names(self):
+        """ Test that malformed or oversized requests are rejected."""
+        response = self.client.post(self.url, dumps({'names': 'Aid'}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            self.url, dumps({'names': [str(i) for i in range(501)]}),
+            content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        for body in (['Fireball'], 'Fireball'):
+            response = self.client.post(self.url, dumps(body),
+                                        content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+
+
+class SpellCatalogTest(TestCase):
+    """ Test the cacheable spell catalog snapshot."""
+    fixtures = ['spell_data.json']
+
+    def setUp(self):
+        self.url = reverse('SE_spell_catalog')
+
+    def test_snapshot(self):
+        """ Test that the snapshot holds every spell and class listing."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        resp = loads(response.content.decode('utf-8'))
+        self.assertEqual(response['ETag'], '"{}"'.format(resp['version']))
+        self.assertEqual(len(resp['spells']), SpellListing.objects.count())
+        self.assertIn('Fireball', resp['classes']['wi'])
+        self.assertNotIn('Fireball', resp['classes']['cl'])
+        self.assertIn('max-age=300', response['Cache-Control'])
+
+    def test_not_modified(self):
+        """ Test that a matching If-None-Match gets a 304."""
+        etag = self.client.get(self.url)['ETag']
+        # the catalog version
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        response = self.client.get(self.url,
+                                   HTTP_IF_NONE_MATCH='"a", W/' + etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_version_bumped_on_write(self):
+        """ Test that writing to the catalog changes the version."""
+        etag = self.client.get(self.url)['ETag']
+        spell = SpellListing.objects.get(name='Aid')
+        spell.description = 'Changed.'
+        spell.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        resp = loads(response.content.decode('utf-8'))
+        aid = [x for x in resp['spells'] if x['name'] == 'Aid'][0]
+        self.assertEqual(aid['description'], 'Changed.')
+
+    def test_versioned_url_immutable(self):
+        """ Test that the versioned URL may be cached indefinitely."""
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, {'v': etag.strip('"')})
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+
+
+class SpellExportTest(OneUserGeneric):
+    """ Test the streaming catalog export API."""
+    fixtures = ['user_mike.json', 'spell_data.json']
+
+    def get_lines(self, fmt, **params):
+        """ Return the lines of the streamed export."""
+        response = self.client.get(
+            reverse('SE_spell_export', kwargs={'fmt': fmt}), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode(
+            'utf-8').splitlines()
+
+    def test_jsonl(self):
+        """ Test that every spell is exported with its classes."""
+        lines = self.get_lines('jsonl')
+        self.assertEqual(len(lines), SpellListing.objects.count())
+        records = {x['name']: x for x in (loads(line) for line in lines)}
+        self.assertEqual(records['Fireball']['classes'], ['sc', 'wi'])
+        self.assertEqual(records['Fireball']['level'], 3)
+
+    def test_csv_filtered(self):
+        """ Test a filtered CSV export without classes."""
+        lines = self.get_lines('csv', level='9', with_classes='false')
+        self.assertTrue(lines[0].startswith('name,level,'))
+        self.assertNotIn('classes', lines[0])
+        self.assertEqual(len(lines) - 1,
+                         SpellListing.objects.filter(level=9).count())
+
+    def test_starred(self):
+        """ Test exporting the user's starred spells."""
+        self.test_user.spells.add(SpellListing.objects.get(name='Aid'))
+        lines = self.get_lines('jsonl', starred='true')
+        self.assertEqual([loads(line)['name'] for line in lines], ['Aid'])
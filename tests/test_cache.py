@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Classes to test cache code.
+"""
+
+from __future__ import unicode_literals
+
+from json import loads
+
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from SymmetricalEureka.cache import LRUCache, spell_cache
+from SymmetricalEureka.models import SpellListing
+from SymmetricalEureka.serializers import SpellListingSerializer
+
+
+class TestLRUCache(TestCase):
+    """ Test the local memory tier."""
+
+    def test_evicts_least_recently_used(self):
+        """ Test that the least recently used item is evicted."""
+        lru = LRUCache(2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        self.assertEqual(lru.get('a'), 1)
+        lru.set('c', 3)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('a'), 1)
+        self.assertEqual(lru.get('c'), 3)
+        self.assertEqual(len(lru), 2)
+
+    def test_clear(self):
+        """ Test that clear empties the cache."""
+        lru = LRUCache(2)
+        lru.set('a', 1)
+        lru.clear()
+        self.assertEqual(lru.get('a', 'missing'), 'missing')
+
+
+class TestSpellPayloadCache(TestCase):
+    """ Test the read-through cache of serialized spells."""
+    fixtures = ['spell_data.json']
+
+    def setUp(self):
+        spell_cache.clear_local()
+        cache.clear()
+
+    def test_payload_matches_serializer(self):
+        """ Test that cached payloads are the serializer output."""
+        spell = SpellListing.objects.get(name='Fireball')
+        self.assertEqual(spell_cache.get('Fireball'),
+                         SpellListingSerializer(spell).data)
+        self.assertIsNone(spell_cache.get('I do not exist'))
+
+    def test_tiers(self):
+        """ Test that each tier is read through to the next."""
+        # Every lookup reads the catalog version.
+        with self.assertNumQueries(2):
+            spell_cache.get_many(['Aid', 'Fireball'])
+        with self.assertNumQueries(1):
+            self.assertEqual(len(spell_cache.get_many(['Aid', 'Fireball'])),
+                             2)
+        spell_cache.clear_local()
+        with self.assertNumQueries(1):
+            self.assertEqual(spell_cache.get('Aid')['name'], 'Aid')
+
+    def test_invalidated_on_write(self):
+        """ Test that saving a spell replaces its cached payload."""
+        self.assertNotEqual(spell_cache.get('Aid')['description'], 'New.')
+        spell = SpellListing.objects.get(name='Aid')
+        spell.description = 'New.'
+        spell.save()
+        self.assertEqual(spell_cache.get('Aid')['description'], 'New.')
+
+        spell.delete()
+        self.assertIsNone(spell_cache.get('Aid'))
+
+    def test_detail_view(self):
+        """ Test that the detail view is served from the cache."""
+        url = reverse('SE_spell_detail', kwargs={'name': 'Aid'})
+        self.client.get(url)
+        # the catalog version
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(loads(response.content.decode('utf-8'))['name'],
+                         'Aid')
+        response = self.client.get(reverse('SE_spell_detail',
+                                           kwargs={'name': 'Nothing'}))
+        self.assertEqual(response.status_code, 404)
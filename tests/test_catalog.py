@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Classes to test catalog code.
+"""
+
+from __future__ import unicode_literals
+
+from json import loads
+
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from SymmetricalEureka.catalog import get_spell_index, iter_bits
+from SymmetricalEureka.models import SpellClasses, SpellListing
+
+
+class TestIterBits(TestCase):
+    """ Test iteration over bitsets."""
+
+    def test_iter_bits(self):
+        """ Test that set bits are yielded lowest first."""
+        self.assertEqual(list(iter_bits(0)), [])
+        self.assertEqual(list(iter_bits(0b100101)), [0, 2, 5])
+        self.assertEqual(list(iter_bits(1 << 500)), [500])
+
+
+class TestSpellIndex(TestCase):
+    """ Test the bitmap index over the catalog."""
+    fixtures = ['spell_data.json']
+
+    def test_classes_match_database(self):
+        """ Test that every class bitset matches the database."""
+        index = get_spell_index()
+        for cls, bits in index.classes.items():
+            expected = SpellClasses.objects.filter(
+                caster_class=cls).order_by('spell__name').values_list(
+                    'spell__name', flat=True)
+            self.assertEqual(index.spell_names(bits), list(expected))
+
+    def test_intersection(self):
+        """ Test that AND-ing bitsets intersects the filters."""
+        index = get_spell_index()
+        bits = index.classes['wi'] & index.levels[3] & index.schools['ev']
+        expected = SpellListing.objects.filter(
+            spellclasses__caster_class='wi', level=3,
+            school='ev').order_by('name').values_list('name', flat=True)
+        self.assertEqual(index.spell_names(bits), list(expected))
+
+    def test_index_reused(self):
+        """ Test that the index is only built once per catalog version."""
+        index = get_spell_index()
+        # the catalog version
+        with self.assertNumQueries(1):
+            self.assertIs(get_spell_index(), index)
+
+    def test_invalidated_on_write(self):
+        """ Test that writing to SpellClasses rebuilds the index."""
+        index = get_spell_index()
+        self.assertNotIn('Fireball', index.spell_names(index.classes['pd']))
+        SpellClasses.objects.create(
+            spell=SpellListing.objects.get(name='Fireball'), caster_class='pd')
+        index = get_spell_index()
+        self.assertIn('Fireball', index.spell_names(index.classes['pd']))
+
+
+class TestSpellClassesView(TestCase):
+    """ Test the REST API for spells by class."""
+    fixtures = ['spell_data.json']
+
+    def get_names(self, cls, **params):
+        """ Return the spell names in the response for cls."""
+        response = self.client.get(
+            reverse('SE_spell_class', kwargs={'cls': cls}), params)
+        self.assertEqual(response.status_code, 200)
+        return [x['spell'] for x in loads(response.content.decode('utf-8'))]
+
+    def test_class(self):
+        """ Test that a class returns its spells without touching the db."""
+        expected = list(SpellClasses.objects.filter(
+            caster_class='bd').order_by('spell__name').values_list(
+                'spell__name', flat=True))
+        self.assertEqual(self.get_names('bd'), expected)
+        # the catalog version
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_names('bd'), expected)
+
+    def test_level_and_school(self):
+        """ Test narrowing a class by level and school."""
+        expected = SpellListing.objects.filter(
+            spellclasses__caster_class='cl', level=0,
+            school='ev').order_by('name').values_list('name', flat=True)
+        self.assertEqual(self.get_names('cl', level='Cantrip', school='ev'),
+                         list(expected))
+
+    def test_unknown_class(self):
+        """ Test that an unknown class has no spells."""
+        self.assertEqual(self.get_names('xx'), [])
+
+
+class TestSpellQueryView(TestCase):
+    """ Test the REST API for combined spell filters."""
+    fixtures = ['spell_data.json']
+
+    def setUp(self):
+        self.url = reverse('SE_spell_query')
+
+    def get_names(self, params):
+        """ Return the spell names in the response to params."""
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [x['spell'] for x in loads(response.content.decode('utf-8'))]
+
+    def test_combined_filters(self):
+        """ Test that any value of a filter and all filters must match."""
+        expected = SpellListing.objects.filter(
+            spellclasses__caster_class__in=['wi', 'sc'], level__in=[1, 3],
+            ritual=True).distinct().order_by('name').values_list(
+                'name', flat=True)
+        self.assertEqual(
+            self.get_names({'class': ['wi', 'sc'], 'level': '1,3',
+                            'ritual': 'true'}),
+            list(expected))
+
+    def test_components_and_concentration(self):
+        """ Test the component and negated boolean filters."""
+        expected = SpellListing.objects.filter(
+            components__in=['V', 'VS'], school='en',
+            concentration=False).order_by('name').values_list(
+                'name', flat=True)
+        self.assertEqual(
+            self.get_names({'component': 'V,VS', 'school': 'en',
+                            'concentration': 'no'}),
+            list(expected))
+
+    def test_no_filters(self):
+        """ Test that no filters returns the whole catalog."""
+        self.assertEqual(len(self.get_names({})),
+                         SpellListing.objects.count())
+
+    def test_bad_filter(self):
+        """ Test that an invalid value is rejected."""
+        response = self.client.get(self.url, {'class': 'wi,xx'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_no_queries(self):
+        """ Test that a warm index only reads the catalog version."""
+        self.get_names({})
+        with self.assertNumQueries(1):
+            self.get_names({'class': 'dr', 'level': 2})
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Classes to test management commands.
+"""
+
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from SymmetricalEureka.catalog import get_catalog_version
+from SymmetricalEureka.catalog_io import SPELL_FIELDS
+from SymmetricalEureka.models import (AbilityScores, Character, SpellClasses,
+                                      SpellListing, UserProfile)
+from SymmetricalEureka.search import SEARCH_TABLE, get_search_index
+
+
+class CommandTestCase(TestCase):
+    """ Generic Test Class with a scratch directory for catalog files."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write_file(self, name, text):
+        """ Write text to a file in the scratch directory."""
+        path = os.path.join(self.tmpdir, name)
+        with io.open(path, 'w', encoding='utf-8') as out:
+            out.write(text)
+        return path
+
+    def call(self, *args, **kwargs):
+        """ Run a command and return its output."""
+        out = io.StringIO()
+        call_command(*args, stdout=out, **kwargs)
+        return out.getvalue()
+
+
+SPELLS = [
+    {'name': 'Zap', 'level': 1, 'school': 'ev', 'components': 'VS',
+     'ritual': False, 'concentration': False, 'casting_time': '1 action',
+     'spell_range': '60 feet', 'duration': 'Instantaneous',
+     'page': 'phb 1', 'description': 'Zap!', 'classes': ['wi', 'sc']},
+    {'name': 'Ráðstöfun', 'level': 0, 'school': 'dv', 'components': 'V',
+     'ritual': True, 'concentration': True, 'casting_time': '1 minute',
+     'spell_range': 'Self', 'duration': '1 hour', 'page': 'phb 2',
+     'description': 'Look.', 'classes': ['cl']},
+]
+
+
+class ImportCatalogTest(CommandTestCase):
+    """ Test the import_catalog command."""
+
+    def write_jsonl(self, spells):
+        """ Write spells as a JSON lines catalog."""
+        return self.write_file('catalog.jsonl', '\n'.join(
+            json.dumps(spell) for spell in spells) + '\n')
+
+    def test_import_jsonl(self):
+        """ Test that spells and their classes are created."""
+        output = self.call('import_catalog', self.write_jsonl(SPELLS))
+        self.assertIn('2 created', output)
+        spell = SpellListing.objects.get(name='Ráðstöfun')
+        self.assertTrue(spell.ritual)
+        self.assertEqual(spell.get_level_display(), 'Cantrip')
+        self.assertEqual(set(SpellClasses.objects.filter(
+            spell__name='Zap').values_list('caster_class', flat=True)),
+                         {'wi', 'sc'})
+
+    def test_reimport_only_changes(self):
+        """ Test that a re-import only writes what changed."""
+        self.call('import_catalog', self.write_jsonl(SPELLS))
+        version = get_catalog_version()
+        output = self.call('import_catalog', self.write_jsonl(SPELLS))
+        self.assertIn('0 created, 0 updated, 2 unchanged', output)
+        self.assertEqual(get_catalog_version(), version)
+
+        spells = [dict(spell) for spell in SPELLS]
+        spells[0]['description'] = 'Zap zap!'
+        spells[0]['classes'] = ['wi', 'bd']
+        output = self.call('import_catalog', self.write_jsonl(spells),
+                           batch_size=1)
+        self.assertIn('0 created, 1 updated, 1 unchanged', output)
+        self.assertIn('1 added, 1 removed', output)
+        self.assertNotEqual(get_catalog_version(), version)
+        self.assertEqual(SpellListing.objects.get(name='Zap').description,
+                         'Zap zap!')
+        self.assertEqual(set(SpellClasses.objects.filter(
+            spell__name='Zap').values_list('caster_class', flat=True)),
+                         {'wi', 'bd'})
+
+    def test_reimport_updates_search(self):
+        """ Test that a re-import only reindexes the spells it changed."""
+        self.call('import_catalog', self.write_jsonl(SPELLS))
+        spells = [dict(spell) for spell in SPELLS]
+        spells[0]['description'] = 'Zoop!'
+        with CaptureQueriesContext(connection) as captured:
+            self.call('import_catalog', self.write_jsonl(spells))
+        self.assertEqual(get_search_index().search('zoop', 5), ['Zap'])
+        # At most a DELETE and an INSERT ... SELECT of the changed spell.
+        self.assertLessEqual(len([query for query in captured
+                                  if SEARCH_TABLE in query['sql']]), 2)
+
+    def test_import_csv(self):
+        """ Test importing a CSV catalog."""
+        path = self.write_file(
+            'catalog.csv',
+            'name,level,school,components,ritual,casting_time,spell_range,'
+            'duration,page,classes\n'
+            'Zap,1,ev,VS,no,1 action,60 feet,Instantaneous,phb 1,wi sc\n'
+            'Ráðstöfun,0,dv,V,yes,1 minute,Self,1 hour,phb 2,cl\n')
+        self.call('import_catalog', path)
+        self.assertTrue(SpellListing.objects.get(name='Ráðstöfun').ritual)
+        self.assertEqual(SpellClasses.objects.count(), 3)
+
+    def test_invalid_catalog(self):
+        """ Test that invalid records are reported."""
+        spells = [dict(SPELLS[0], school='xx')]
+        with self.assertRaises(CommandError):
+            self.call('import_catalog', self.write_jsonl(spells))
+        spells = [dict(SPELLS[0], classes=['xx'])]
+        with self.assertRaises(CommandError):
+            self.call('import_catalog', self.write_jsonl(spells))
+        with self.assertRaises(CommandError):
+            self.call('import_catalog', self.write_file('bad.jsonl', '[\n'))
+        with self.assertRaises(CommandError):
+            self.call('import_catalog', self.write_file('bad.txt', ''))
+
+
+class ExportCatalogTest(CommandTestCase):
+    """ Test the export_catalog command."""
+    fixtures = ['user_mike.json', 'spell_data.json']
+
+    def catalog(self):
+        """ Return the catalog as a comparable list."""
+        return [(spell, sorted(SpellClasses.objects.filter(
+            spell__name=spell['name']).values_list('caster_class', flat=True)))
+                for spell in SpellListing.objects.order_by('name').values(
+                    *SPELL_FIELDS)]
+
+    def test_round_trip(self):
+        """ Test that exported catalogs import back unchanged."""
+        SpellListing.objects.create(
+            name='Ráðstöfun, "the look"', school='dv', page='phb 2',
+            casting_time='1 minute', spell_range='Self', duration='1 hour')
+        expected = self.catalog()
+        for fmt in ('jsonl', 'csv'):
+            path = os.path.join(self.tmpdir, 'spells.' + fmt)
+            self.call('export_catalog', path)
+            SpellListing.objects.all().delete()
+            self.call('import_catalog', path)
+            self.assertEqual(self.catalog(), expected)
+
+    def test_stdout_without_classes(self):
+        """ Test exporting to stdout without classes."""
+        lines = self.call('export_catalog', '--no-classes').splitlines()
+        self.assertEqual(len(lines), SpellListing.objects.count())
+        record = json.loads(lines[0])
+        self.assertNotIn('classes', record)
+        self.assertEqual(
+            record['name'],
+            SpellListing.objects.order_by('name').first().name)
+
+    def test_starred_by(self):
+        """ Test exporting the spells a user starred."""
+        profile = UserProfile.objects.get(user_name='Mike')
+        profile.spells.add(SpellListing.objects.get(name='Aid'))
+        lines = self.call('export_catalog', '--starred-by', 'Mike')
+        self.assertEqual([json.loads(line)['name']
+                          for line in lines.splitlines()], ['Aid'])
+        with self.assertRaises(CommandError):
+            self.call('export_catalog', '--starred-by', 'Nobody')
+
+
+class BenchmarkTemplatetagsTest(CommandTestCase):
+    """ Test the benchmark_templatetags command."""
+
+    def test_reports_times(self):
+        """ Test that a time per sheet is reported for each method."""
+        out = self.call('benchmark_templatetags', sheets=2, repeat=1)
+        lines = out.splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith('tags: best '))
+        self.assertTrue(lines[1].startswith('template: best '))
+        self.assertIn('per sheet of 6 scores', lines[1])
+
+
+class BenchmarkSpellFiltersTest(CommandTestCase):
+    """ Test the benchmark_spell_filters command."""
+
+    def test_uses_indexes(self):
+        """ Test that every filter query uses its index."""
+        out = self.call('benchmark_spell_filters', spells=200, repeat=1)
+        lines = out.splitlines()
+        self.assertEqual(len(lines), 3)
+        for line in lines:
+            self.assertIn(' uses SymmetricalEureka_', line)
+
+    def test_rolls_back(self):
+        """ Test that the synthetic catalog isn't kept."""
+        self.call('benchmark_spell_filters', spells=20, repeat=1)
+        self.assertFalse(SpellListing.objects.filter(
+            name__startswith='Synthetic Spell').exists())
+        self.assertFalse(SpellClasses.objects.exists())
+
+
+class GenerateSyntheticDataTest(CommandTestCase):
+    """ Test the generate_synthetic_data command."""
+
+    def test_counts(self):
+        """ Test that the requested volumes are added."""
+        self.call('generate_synthetic_data', spells=30, users=4,
+                  characters=2, stars=5)
+        self.assertEqual(SpellListing.objects.count(), 30)
+        self.assertEqual(UserProfile.objects.count(), 4)
+        self.assertEqual(Character.objects.count(), 8)
+        self.assertEqual(AbilityScores.objects.count(), 48)
+        self.assertEqual(UserProfile.spells.through.objects.count(), 20)
+
+    def test_adds_more(self):
+        """ Test that running it again adds new rows."""
+        self.call('generate_synthetic_data', spells=3, users=2)
+        self.call('generate_synthetic_data', spells=3, users=2)
+        self.assertEqual(SpellListing.objects.count(), 6)
+        self.assertEqual(UserProfile.objects.count(), 4)
+
+
+class BenchmarkViewsTest(CommandTestCase):
+    """ Test the benchmark_views command."""
+    fixtures = ['user_mike.json', 'zeke.json', 'spell_data.json']
+    views = ('SpellListView', 'DisplayCharacterView', 'CharacterAtributeView',
+             'SpellClassesView', 'UserSpellView')
+
+    def benchmark(self, **options):
+        """ Run the command with as few requests as possible."""
+        return self.call('benchmark_views', requests=2, warmup=0,
+                         allocations=1, **options)
+
+    def test_save(self):
+        """ Test that every view is measured and saved as a baseline."""
+        path = os.path.join(self.tmpdir, 'baseline.json')
+        out = self.benchmark(save=path)
+        self.assertEqual([line.split(':')[0] for line in out.splitlines()],
+                         list(self.views))
+        with io.open(path, encoding='utf-8') as infile:
+            baseline = json.load(infile)
+        self.assertEqual(list(baseline['views']), list(self.views))
+        for result in baseline['views'].values():
+            self.assertGreater(result['queries'], 0)
+            self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+        # The star toggled by UserSpellView is rolled back.
+        self.assertFalse(UserProfile.spells.through.objects.exists())
+
+    def test_compare(self):
+        """ Test that a regression against the baseline is an error."""
+        path = self.write_file('baseline.json', json.dumps({'views': {
+            view: {'p50_ms': 1e6, 'p95_ms': 1e6, 'queries': 100,
+                   'peak_kib': 1e6} for view in self.views}}))
+        out = self.benchmark(compare=path)
+        self.assertIn('SpellListView: p50 ', out.split('Compared to')[1])
+
+        path = self.write_file('baseline.json', json.dumps({'views': {
+            'SpellListView': {'p50_ms': 1e-6, 'p95_ms': 1e-6, 'queries': 0,
+                              'peak_kib': None}}}))
+        with self.assertRaisesRegexp(CommandError,
+                                     'SpellListView p95, SpellListView '
+                                     'queries'):
+            self.benchmark(compare=path)
+
+    def test_needs_a_character(self):
+        """ Test that the command fails without a character."""
+        Character.objects.all().delete()
+        with self.assertRaises(CommandError):
+            self.benchmark()
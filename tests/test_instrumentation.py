@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Classes to test the request instrumentation.
+"""
+
+from __future__ import unicode_literals
+
+import re
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.test import TestCase, override_settings
+
+from SymmetricalEureka.instrumentation import (MetricsRegistry,
+                                               RequestMetrics, registry,
+                                               timer)
+from SymmetricalEureka.models import Character
+
+
+def server_timing(response):
+    """ Return the Server-Timing metrics of response, by name."""
+    metrics = {}
+    for metric in response['Server-Timing'].split(', '):
+        name, _, params = metric.partition(';')
+        metrics[name] = dict(param.split('=', 1)
+                             for param in params.split(';'))
+    return metrics
+
+
+class ServerTimingTest(TestCase):
+    """ Test the Server-Timing header of instrumented views."""
+    fixtures = ['user_mike.json', 'zeke.json', 'spell_data.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        """ Initialize database for tests."""
+        # pylint: disable=no-member
+        cls.test_user = User.objects.get(username="Mike")
+        cls.url = reverse('SE_character', kwargs={
+            'Char_uuid': Character.objects.get(
+                character_name="Zeke").Char_uuid})
+
+    def setUp(self):
+        """ Log user in, with nothing measured or cached."""
+        cache.clear()
+        registry.clear()
+        try:
+            self.client.force_login(self.test_user)
+        except AttributeError:
+            # For Django 1.8
+            self.client.login(username="Mike", password="password")
+
+    def test_character_sheet(self):
+        """ Test that the queries and rendering of a page are reported."""
+        with self.assertNumQueries(5):
+            response = self.client.get(self.url)
+        metrics = server_timing(response)
+        self.assertEqual(metrics['db']['desc'], '"5 queries"')
+        self.assertIn('render', metrics)
+        self.assertGreaterEqual(float(metrics['total']['dur']),
+                                float(metrics['render']['dur']))
+
+    def test_serializer_time(self):
+        """ Test that REST views report the time spent serializing."""
+        response = self.client.get(reverse('SE_spell_list_api'))
+        self.assertEqual(response.status_code, 200)
+        metrics = server_timing(response)
+        self.assertIn('serializer', metrics)
+        self.assertIn('render', metrics)
+
+    def test_not_instrumented(self):
+        """ Test that views not marked instrumented aren't measured."""
+        response = self.client.get(reverse('new_character'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_registry(self):
+        """ Test that the totals of each view are kept."""
+        self.client.get(self.url)
+        self.client.get(self.url)
+        totals = registry.totals('DisplayCharacterView')
+        self.assertEqual(totals['requests_total'], 2)
+        # The character list is cached by the first request.
+        self.assertEqual(totals['queries_total'], 9)
+        self.assertGreater(totals['render_seconds_total'], 0)
+        self.assertEqual(registry.totals('SpellListView'), {})
+
+
+class MetricsRegistryTest(TestCase):
+    """ Test the Prometheus rendering of MetricsRegistry."""
+
+    def test_render(self):
+        """ Test the exposition format."""
+        metrics = RequestMetrics('Spell"View')
+        metrics.queries = 3
+        metrics.durations['serializer'] = 0.25
+        metrics_registry = MetricsRegistry()
+        metrics_registry.record(metrics)
+        text = metrics_registry.render()
+        self.assertIn('# TYPE symmetricaleureka_queries_total counter\n',
+                      text)
+        self.assertIn('symmetricaleureka_queries_total{view="Spell\\"View"} '
+                      '3.0\n', text)
+        self.assertIn('symmetricaleureka_serializer_seconds_total'
+                      '{view="Spell\\"View"} 0.25\n', text)
+        self.assertTrue(all(re.match(r'^(# |symmetricaleureka_)', line)
+                            for line in text.splitlines()))
+
+    def test_timer_outside_request(self):
+        """ Test that timer does nothing outside of a measured request."""
+        with timer('serializer'):
+            pass
+
+
+class MetricsViewTest(TestCase):
+    """ Test who may read the metrics."""
+    fixtures = ['user_mike.json']
+
+    def setUp(self):
+        """ Log user in."""
+        self.user = User.objects.get(username="Mike")
+        try:
+            self.client.force_login(self.user)
+        except AttributeError:
+            # For Django 1.8
+            self.client.login(username="Mike", password="password")
+
+    def test_forbidden(self):
+        """ Test that other users can't read the metrics."""
+        response = self.client.get(reverse('SE_metrics'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_staff(self):
+        """ Test that staff can read the metrics."""
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        response = self.client.get(reverse('SE_metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertContains(response, '# TYPE symmetricaleureka_')
+
+    @override_settings(INTERNAL_IPS=['127.0.0.1'])
+    def test_internal_ips(self):
+        """ Test that INTERNAL_IPS can read the metrics."""
+        self.client.logout()
+        response = self.client.get(reverse('SE_metrics'))
+        self.assertEqual(response.status_code, 200)
@@ -116,6 +116,18 @@ class TestAbilityScoreClassFunctions(TestCase):
         self.assertEqual(AbilityScores.abs_saving_throw(14, True),
                          AbilityScores.ability_score_mod(14) + 2)
 
+    def test_tables(self):
+        """ Test the tables of modifiers and saving throws."""
+        tables = AbilityScores.tables()
+        self.assertEqual(sorted(tables['ability_score_mod']),
+                         list(range(1, 26)))
+        self.assertEqual(tables['ability_score_mod'][1], -5)
+        self.assertEqual(tables['ability_score_mod'][25], 7)
+        self.assertEqual(tables['abs_saving_throw']['proficient'][14],
+                         AbilityScores.abs_saving_throw(14, True))
+        self.assertEqual(tables['abs_saving_throw']['unproficient'][14],
+                         AbilityScores.abs_saving_throw(14, False))
+
 
 class TestAbilityScoresClass(TestCase):
     """ Tests of the AbilityScores class."""
@@ -220,3 +232,11 @@ class TestSpellListing(TestCase):
         """ Test that fields exist and are of the desired type."""
         instance = SpellListing()
         self.assertTrue(hasattr(instance, 'name'))
+
+    def test_natural_key(self):
+        """ Test that spells have integer keys and are found by name."""
+        spell = SpellListing.objects.get_by_natural_key('Fireball')
+        self.assertIsInstance(spell.pk, int)
+        self.assertEqual(spell.natural_key(), ('Fireball',))
+        self.assertTrue(spell.spellclasses_set.filter(
+            caster_class='wi').exists())
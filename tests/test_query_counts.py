@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Classes that pin the number of queries made by views.
+"""
+
+from __future__ import unicode_literals
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from SymmetricalEureka.models import AbilityScores, Character
+
+
+class QueryBudgetMixin(object):
+    """
+    Mixin for TestCase that fails if a page makes a different number of
+    queries than its budget.  Two of the queries of a logged in request are
+    the session and user lookups.
+    """
+
+    def assertQueryBudget(self, url, budget, status_code=200):
+        """ GET url, which must make exactly budget queries."""
+        # pylint: disable=invalid-name
+        with self.assertNumQueries(budget):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status_code)
+        return response
+
+
+class CharacterSheetQueriesTest(QueryBudgetMixin, TestCase):
+    """ Pin the queries made to display a character sheet."""
+    fixtures = ['user_mike.json', 'user_tim.json', 'zeke.json']
+    # session, user, character with player, ability scores, character list
+    budget = 5
+
+    @classmethod
+    def setUpTestData(cls):
+        """ Initialize database for tests."""
+        # pylint: disable=no-member
+        cls.test_user = User.objects.get(username="Mike")
+        cls.test_character = Character.objects.get(character_name="Zeke")
+        cls.url = reverse('SE_character',
+                          kwargs={'Char_uuid': cls.test_character.Char_uuid})
+
+    def setUp(self):
+        """ Log user in, with nothing cached."""
+        cache.clear()
+        try:
+            self.client.force_login(self.test_user)
+        except AttributeError:
+            # For Django 1.8
+            self.client.login(username="Mike", password="password")
+
+    def test_character_sheet(self):
+        """ Test the query count of the character sheet."""
+        self.assertQueryBudget(self.url, self.budget)
+
+    def test_cached_character_list(self):
+        """ Test that the header's character list is cached."""
+        self.assertQueryBudget(self.url, self.budget)
+        self.assertQueryBudget(self.url, self.budget - 1)
+
+    def test_independent_of_proficiencies(self):
+        """ Test that saving throws don't query for the character."""
+        AbilityScores.objects.filter(
+            character=self.test_character).update(proficient=True)
+        response = self.assertQueryBudget(self.url, self.budget)
+        self.assertContains(response, 'id="id_sav_prof_strength"')
+
+    def test_other_users_character(self):
+        """ Test that a forbidden character is rejected early."""
+        self.client.logout()
+        self.client.login(username="Tim", password="password")
+        self.assertQueryBudget(self.url, 3, status_code=403)
+
+
+class NewCharacterQueriesTest(TestCase):
+    """ Pin the queries made to create a character."""
+    fixtures = ['user_mike.json']
+
+    def setUp(self):
+        """ Log user in."""
+        try:
+            self.client.force_login(User.objects.get(username="Mike"))
+        except AttributeError:
+            # For Django 1.8
+            self.client.login(username="Mike", password="password")
+
+    def test_new_character(self):
+        """ Test that the character and its scores take two INSERTs."""
+        data = {'character_name': 'Hrothgar', 'alignment': 'CG'}
+        for _, name in AbilityScores.WHICH_CHOICES:
+            data['{}-value'.format(name)] = 9
+        # session, user, profile, two INSERTs, plus the savepoint
+        with self.assertNumQueries(7):
+            response = self.client.post(reverse('new_character'), data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(AbilityScores.objects.filter(
+            character__character_name='Hrothgar').count(), 6)
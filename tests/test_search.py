@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Classes to test search code.
+"""
+
+from __future__ import unicode_literals
+
+from json import loads
+
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from SymmetricalEureka import search
+from SymmetricalEureka.catalog import bump_catalog_version
+from SymmetricalEureka.models import SpellListing
+from SymmetricalEureka.search import (FTS5SpellIndex, TokenSpellIndex,
+                                      get_search_index, tokenize)
+
+
+class SearchIndexTests(object):
+    """ Tests shared by every search index implementation."""
+    fixtures = ['spell_data.json']
+    index = None
+
+    def test_name_match_ranked_first(self):
+        """ Test that a spell whose name matches beats description matches."""
+        names = self.index.search('fireball', 10)
+        self.assertEqual(names[0], 'Fireball')
+
+    def test_prefix_and_all_terms(self):
+        """ Test that terms are prefixes and that all terms must match."""
+        names = self.index.search('otiluke freez', 10)
+        self.assertEqual(names, ["Otiluke's Freezing Sphere"])
+        self.assertEqual(self.index.search('fireball zzzzz', 10), [])
+
+    def test_limit(self):
+        """ Test that no more than limit results are returned."""
+        self.assertEqual(len(self.index.search('the', 5)), 5)
+
+    def test_non_ascii_query(self):
+        """ Test that terms outside ASCII can be searched for."""
+        self.assertEqual(self.index.search('ráðstöfun', 5), [])
+
+    def test_empty_query(self):
+        """ Test that a query without any terms matches nothing."""
+        self.assertEqual(self.index.search(' !? ', 5), [])
+
+    def test_incremental_updates(self):
+        """ Test that saving and deleting spells updates the index."""
+        spell = SpellListing.objects.create(
+            name='Quibbleflux', school='tr',
+            description='A wholly unremarkable zyzzyva appears.')
+        self.assertEqual(self.index.search('zyzzyva', 5), ['Quibbleflux'])
+
+        spell.description = 'Nothing happens.'
+        spell.save()
+        self.assertEqual(self.index.search('zyzzyva', 5), [])
+        self.assertEqual(self.index.search('quibble', 5), ['Quibbleflux'])
+
+        spell.delete()
+        self.assertEqual(self.index.search('quibble', 5), [])
+
+    def test_rename(self):
+        """ Test that a renamed spell is only found by its new name."""
+        spell = SpellListing.objects.get(name='Fireball')
+        spell.name = 'Blazing Orb'
+        spell.save()
+        self.assertNotIn('Fireball', self.index.search('fireball', 50))
+        self.assertEqual(self.index.search('blazing orb', 5)[0],
+                         'Blazing Orb')
+        self.assertIn('Blazing Orb', self.index.search('fire', 50))
+
+
+class FTS5SpellIndexTest(SearchIndexTests, TestCase):
+    """ Tests of the index stored in SQLite."""
+
+    def setUp(self):
+        self.index = get_search_index()
+        if not isinstance(self.index, FTS5SpellIndex):
+            self.skipTest('SQLite FTS5 is not available.')
+
+    def test_rebuild(self):
+        """ Test that rebuilding the index keeps the same results."""
+        names = self.index.search('fire', 20)
+        self.index.rebuild()
+        self.assertEqual(self.index.search('fire', 20), names)
+
+
+class TokenSpellIndexTest(SearchIndexTests, TestCase):
+    """ Tests of the in-process index."""
+
+    def setUp(self):
+        # pylint: disable=protected-access
+        self.old_index = search._search_index
+        self.index = search._search_index = TokenSpellIndex()
+
+    def tearDown(self):
+        # pylint: disable=protected-access
+        search._search_index = self.old_index
+
+    def test_updated_in_place(self):
+        """ Test that a write in this process doesn't rebuild the index."""
+        self.index.search('zyzzyva', 5)
+        SpellListing.objects.create(name='Quibbleflux', school='tr',
+                                    description='A zyzzyva appears.')
+        # the catalog version only
+        with self.assertNumQueries(1):
+            self.assertEqual(self.index.search('zyzzyva', 5), ['Quibbleflux'])
+
+    def test_catalog_version(self):
+        """ Test that writes made elsewhere show once the version changes."""
+        self.assertEqual(self.index.search('zyzzyva', 5), [])
+        SpellListing.objects.filter(name='Aid').update(
+            description='A zyzzyva appears.')
+        bump_catalog_version()
+        self.assertEqual(self.index.search('zyzzyva', 5), ['Aid'])
+
+    def test_tokenize(self):
+        """ Test that text is split into lower case words."""
+        self.assertEqual(tokenize("Otiluke's Freezing-Sphere"),
+                         ['otiluke', 's', 'freezing', 'sphere'])
+
+
+class SpellSearchViewTest(TestCase):
+    """ Test the spell search API."""
+    fixtures = ['spell_data.json']
+
+    def test_search(self):
+        """ Test that results are returned best match first."""
+        response = self.client.get(reverse('SE_spell_search'),
+                                   {'q': 'fireball', 'limit': 3})
+        resp = loads(response.content.decode('utf-8'))
+        self.assertEqual(resp[0], {'spell': 'Fireball'})
+        self.assertLessEqual(len(resp), 3)
+
+    def test_bad_limit(self):
+        """ Test that a bad limit falls back to the default."""
+        response = self.client.get(reverse('SE_spell_search'),
+                                   {'q': 'the', 'limit': 'lots'})
+        resp = loads(response.content.decode('utf-8'))
+        self.assertEqual(len(resp), 20)
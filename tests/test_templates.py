@@ -85,6 +85,11 @@ class OneUserTemplateTests(TestCase):
         response = self.client.get(self.test_url)
         self.assertContains(response, 'Saving Throws')
 
+    def test_tables_new_char(self):
+        """ Test that the modifier tables are in the new character page."""
+        response = self.client.get(self.test_url)
+        self.assertContains(response, 'var ability_score_tables = ')
+
 
 class OneCharTemplateTests(TestCase):
     """ Class of tests for the New Character page."""
@@ -160,3 +165,11 @@ class OneCharTemplateTests(TestCase):
         """ Test that saving throws appear on character page."""
         response = self.client.get(self.test_url)
         self.assertContains(response, 'Saving Throws')
+
+    def test_tables_in_character(self):
+        """ Test that the modifier tables and api url are in the page."""
+        response = self.client.get(self.test_url)
+        self.assertContains(response, 'var ability_score_tables = ')
+        self.assertContains(response, 'var ability_scores_url = "{}";'.format(
+            reverse('SE_character_scores', kwargs={
+                'Char_uuid': self.test_character.Char_uuid})))
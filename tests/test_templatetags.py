@@ -6,6 +6,8 @@ Classes to test templatetags code.
 # from __future__ import unicode_literals
 
 # from django.db.utils import IntegrityError
+from json import loads
+
 from django.contrib.auth.models import User
 # from django.core.exceptions import ValidationError
 from django.test import TestCase
@@ -13,7 +15,8 @@ from django.test import TestCase
 
 from SymmetricalEureka.models import AbilityScores, Character
 from SymmetricalEureka.templatetags.SymmetricalEureka import\
-    _bs_ability_score_display  # _bs_ability_score_field
+    ABILITY_SCORE_DISPLAY, _ability_score_tables, _bs_ability_score_display,\
+    _bs_saving_throw_display
 
 
 class AbilityScoreDisplayTest(TestCase):
@@ -40,3 +43,56 @@ class AbilityScoreDisplayTest(TestCase):
             AbilityScores.ability_score_mod(strength.value))
 
         self.assertInHTML(expected_result, result)
+
+
+class SavingThrowDisplayTest(TestCase):
+    """
+    Tests for the _bs_saving_throw_display function.
+    """
+
+    def test_proficiency_class(self):
+        """ Test that the saving throw and proficiency are rendered."""
+        score = AbilityScores(character=Character(), which='4_WIS', value=14,
+                              proficient=True)
+        result = _bs_saving_throw_display(score)
+        self.assertInHTML('<p class="sav-score" id="id_sav_wisdom">+4</p>',
+                          result)
+        self.assertInHTML(
+            '<p class="proficient" id="id_sav_prof_wisdom"></p>', result)
+
+
+class WhichTemplateTest(TestCase):
+    """
+    Tests for WhichTemplate.
+    """
+
+    def test_compiled_once(self):
+        """ Test that the static parts are filled in once per which."""
+        compiled = ABILITY_SCORE_DISPLAY.compile('1_DEX')
+        self.assertIn('id="id_mod_dexterity"', compiled)
+        self.assertIs(ABILITY_SCORE_DISPLAY.compile('1_DEX'), compiled)
+
+    def test_values_escaped(self):
+        """ Test that values are escaped when rendered."""
+        result = ABILITY_SCORE_DISPLAY.render('1_DEX', val='<b>', mod=0)
+        self.assertIn('&lt;b&gt;', result)
+        self.assertNotIn('<b>', result)
+
+
+class AbilityScoreTablesTest(TestCase):
+    """
+    Tests for the _ability_score_tables function.
+    """
+
+    def test_tables_script(self):
+        """ Test that the script defines the tables as JSON."""
+        result = _ability_score_tables()
+        prefix = '<script>var ability_score_tables = '
+        suffix = ';</script>'
+        self.assertTrue(result.startswith(prefix))
+        self.assertTrue(result.endswith(suffix))
+        tables = loads(result[len(prefix):-len(suffix)])
+        self.assertEqual(tables['ability_score_mod']['18'],
+                         AbilityScores.ability_score_mod(18))
+        self.assertEqual(tables['abs_saving_throw']['proficient']['18'],
+                         AbilityScores.abs_saving_throw(18, True))
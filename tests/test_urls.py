@@ -54,11 +54,11 @@ class UrlTest(TestCase):
         self.assertEqual(found.func.__name__, views.LoginView.__name__)
 
     def test_user_spell_resolves(self):
-        found = resolve(reverse('UserSpell', kwargs={'pk': 'Aid'}))
+        found = resolve(reverse('UserSpell', kwargs={'name': 'Aid'}))
         self.assertEqual(found.func.__name__, views.UserSpellView.__name__)
 
     def test_empty_user_spell_resolves(self):
-        found = resolve(reverse('UserSpell', kwargs={'pk': ''}))
+        found = resolve(reverse('UserSpell', kwargs={'name': ''}))
         self.assertEqual(found.func.__name__, views.UserSpellView.__name__)
 
     def test_spell_class_resolves(self):
@@ -68,3 +68,51 @@ class UrlTest(TestCase):
     def test_empty_spell_class_resolves(self):
         found = resolve(reverse('SE_spell_class', kwargs={'cls': ''}))
         self.assertEqual(found.func.__name__, views.SpellClassesView.__name__)
+
+    def test_spell_list_api_resolves(self):
+        found = resolve(reverse('SE_spell_list_api'))
+        self.assertEqual(found.func.__name__, views.SpellListAPIView.__name__)
+
+    def test_spell_search_resolves(self):
+        found = resolve(reverse('SE_spell_search'))
+        self.assertEqual(found.func.__name__, views.SpellSearchView.__name__)
+
+    def test_spell_details_resolves(self):
+        found = resolve(reverse('SE_spell_details'))
+        self.assertEqual(found.func.__name__,
+                         views.SpellDetailBatchView.__name__)
+
+    def test_spell_catalog_resolves(self):
+        found = resolve(reverse('SE_spell_catalog'))
+        self.assertEqual(found.func.__name__, views.SpellCatalogView.__name__)
+
+    def test_spell_query_resolves(self):
+        found = resolve(reverse('SE_spell_query'))
+        self.assertEqual(found.func.__name__, views.SpellQueryView.__name__)
+
+    def test_spell_export_resolves(self):
+        found = resolve(reverse('SE_spell_export', kwargs={'fmt': 'csv'}))
+        self.assertEqual(found.func.__name__, views.SpellExportView.__name__)
+
+    def test_character_scores_resolve(self):
+        found = resolve(reverse('SE_character_scores',
+                                kwargs={'Char_uuid': uuid4()}))
+        self.assertEqual(found.func.__name__,
+                         views.CharacterAbilityScoresView.__name__)
+
+    def test_characters_resolve(self):
+        found = resolve(reverse('SE_characters'))
+        self.assertEqual(found.func.__name__,
+                         views.CharacterCreateView.__name__)
+
+    def test_class_method_batch_resolves(self):
+        found = resolve(reverse('SE_ClassMethodBatch',
+                                kwargs={'model': 'AbilityScores',
+                                        'method': 'ability_score_mod'}))
+        self.assertEqual(found.func.__name__,
+                         views.ClassMethodBatchView.__name__)
+
+    def test_starred_spells_resolve(self):
+        found = resolve(reverse('SE_starred_spells'))
+        self.assertEqual(found.func.__name__,
+                         views.StarredSpellsView.__name__)
@@ -6,12 +6,14 @@ Classes to test views code.
 from __future__ import unicode_literals
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.urlresolvers import reverse  # , resolve
 from django.http import HttpResponseRedirect
 from django.test import TestCase, Client
 from django.utils.html import escape
 
-from SymmetricalEureka.models import AbilityScores, Character
+from SymmetricalEureka.models import (AbilityScores, Character, SpellListing,
+                                      UserProfile)
 
 
 class NoUserTests(TestCase):
@@ -194,6 +196,59 @@ class UserWithCharacterTests(TestCase):
         self.assertNotContains(response, "['Zeke']")
 
 
+class CharacterListCacheTests(TestCase):
+    """
+    Tests that the cached character list in the header stays current.
+    """
+    fixtures = ['user_mike.json', 'zeke.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        """ Initialize database for tests."""
+        # pylint: disable=no-member
+        cls.test_user = User.objects.get(username="Mike")
+
+    def setUp(self):
+        """ Log user in, and cache the character list."""
+        cache.clear()
+        self.test_character = Character.objects.get(character_name="Zeke")
+        try:
+            self.client.force_login(self.test_user)
+        except AttributeError:
+            # For Django 1.8
+            self.client.login(username="Mike", password="password")
+        self.assertContains(self.client.get(reverse('SE_home')), 'Zeke')
+
+    def test_links(self):
+        """ Test that the list holds names and uuids only."""
+        self.assertEqual(
+            Character.objects.links_for_user(self.test_user.pk),
+            [('Zeke', self.test_character.Char_uuid)])
+
+    def test_rename(self):
+        """ Test that a renamed character is shown by its new name."""
+        self.test_character.character_name = 'Ezekiel'
+        self.test_character.save()
+        response = self.client.get(reverse('SE_home'))
+        self.assertContains(response, 'Ezekiel')
+
+    def test_delete(self):
+        """ Test that a deleted character is dropped from the list."""
+        self.test_character.delete()
+        response = self.client.get(reverse('SE_home'))
+        self.assertNotContains(response, 'Zeke')
+
+    def test_create(self):
+        """ Test that a new character is added to the list."""
+        data = {'character_name': 'Hrothgar', 'alignment': 'CG'}
+        for _, name in AbilityScores.WHICH_CHOICES:
+            data['{}-value'.format(name)] = 9
+        self.client.post(reverse('new_character'), data)
+        response = self.client.get(reverse('SE_home'))
+        self.assertContains(response, 'Hrothgar')
+        self.assertContains(response, 'Zeke')
+
+
 class TwoUsersWithCharacterTests(TestCase):
     """
     Class of tests that require a logged in user with a character.
@@ -260,3 +315,67 @@ class TestUnicode(TestCase):
         """ Test that unicode name appears as title on character page."""
         response = self.client.get(self.test_character_url)
         self.assertContains(response, "<h1>Ráðormsdóttir</h1>".encode('utf-8'))
+
+
+class SpellListTests(TestCase):
+    """ Tests of the spell list page."""
+    fixtures = ['user_mike.json', 'spell_data.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        """ Initialize database for tests."""
+        # pylint: disable=no-member
+        cls.test_user = User.objects.get(username="Mike")
+
+    def setUp(self):
+        """ Log user in."""
+        try:
+            self.client.force_login(self.test_user)
+        except AttributeError:
+            # For Django 1.8
+            self.client.login(username="Mike", password="password")
+
+    def get_stars(self):
+        """ Return the number of filled stars on the spell list page."""
+        response = self.client.get(reverse('SE_spell_list'))
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode('utf-8').count(
+            'class="glyphicon glyphicon-star"')
+
+    def test_starred_spells_marked(self):
+        """ Test that exactly the starred spells are marked."""
+        self.assertEqual(self.get_stars(), 0)
+        profile = UserProfile.objects.get(user=self.test_user)
+        profile.spells.add(*SpellListing.objects.all()[:25])
+        self.assertEqual(self.get_stars(), 25)
+
+    def test_starred_query_count(self):
+        """
+        Test that the number of queries doesn't depend on how many spells are
+        starred.
+        """
+        self.get_stars()
+        # session, user, catalog version, starred spells; the rows are
+        # already rendered
+        with self.assertNumQueries(4):
+            self.get_stars()
+        profile = UserProfile.objects.get(user=self.test_user)
+        profile.spells.add(*SpellListing.objects.all()[:200])
+        with self.assertNumQueries(4):
+            self.get_stars()
+
+    def test_rows_follow_catalog(self):
+        """ Test that the cached rows are rendered again after a change."""
+        response = self.client.get(reverse('SE_spell_list'))
+        self.assertContains(response, '<td class="name">Fireball</td>',
+                            html=True)
+        spell = SpellListing.objects.get(name='Fireball')
+        spell.page = 'phb 999'
+        spell.save()
+        response = self.client.get(reverse('SE_spell_list'))
+        self.assertContains(response, 'phb 999')
+
+    def test_anonymous_user(self):
+        """ Test that the spell list renders without a logged in user."""
+        self.client.logout()
+        self.assertEqual(self.get_stars(), 0)